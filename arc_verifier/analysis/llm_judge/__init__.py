@@ -26,6 +26,7 @@ from .providers.factory import create_fallback_provider, create_provider
 # Import specialized analyzers for advanced usage
 from .security.analyzers import (
     CapitalRiskAnalyzer,
+    CombinedSecurityAnalyzer,
     DeceptionDetector,
     KeySecurityAnalyzer,
     TransactionControlAnalyzer,
@@ -53,6 +54,7 @@ __all__ = [
     "TransactionControlAnalyzer",
     "DeceptionDetector",
     "CapitalRiskAnalyzer",
+    "CombinedSecurityAnalyzer",
     "TrustScoreCalculator",
     "EnsembleEvaluator",
     "create_provider",
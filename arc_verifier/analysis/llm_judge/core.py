@@ -1,6 +1,9 @@
 """Core LLM judge orchestrator for trust-focused agent evaluation."""
 
+import asyncio
 import os
+import threading
+from datetime import datetime
 from typing import Any
 from pathlib import Path
 from dotenv import load_dotenv
@@ -10,31 +13,35 @@ env_path = Path(__file__).parent.parent.parent.parent / '.env'
 if env_path.exists():
     load_dotenv(env_path, override=True)
 
-from rich.console import Console
-
 from .evaluation.ensemble import EnsembleEvaluator
 from .models import LLMJudgeResult, LLMProvider, TrustFocusedResult
+from .providers.base import run_sync
 from .providers.factory import create_fallback_provider, create_provider
 from .security.analyzers import (
     CapitalRiskAnalyzer,
+    CombinedSecurityAnalyzer,
     DeceptionDetector,
     KeySecurityAnalyzer,
     TransactionControlAnalyzer,
 )
 from .security.scoring import TrustScoreCalculator
-from .utils import load_evaluation_templates, prepare_evaluation_context
+from .utils import console, load_evaluation_templates, prepare_evaluation_context
 
 
 class LLMJudge:
     """LLM-as-Judge integration for advanced agent evaluation."""
 
+    # Process-wide judges by primary provider, see shared()
+    _shared: dict[LLMProvider, "LLMJudge"] = {}
+    _shared_lock = threading.Lock()
+
     def __init__(
         self,
         primary_provider: LLMProvider = LLMProvider.ANTHROPIC,
         fallback_provider: LLMProvider | None = LLMProvider.OPENAI,
         enable_ensemble: bool = True,
     ):
-        self.console = Console()
+        self.console = console
 
         # Load from environment variables if available
         env_provider = os.getenv("LLM_PRIMARY_PROVIDER")
@@ -54,17 +61,33 @@ class LLMJudge:
         self.primary_llm_provider = create_provider(self.primary_provider)
         self.fallback_llm_provider = create_fallback_provider()
 
-        # Initialize analyzers
-        self.key_security_analyzer = KeySecurityAnalyzer()
-        self.transaction_control_analyzer = TransactionControlAnalyzer()
-        self.deception_detector = DeceptionDetector()
-        self.capital_risk_analyzer = CapitalRiskAnalyzer()
+        # Initialize analyzers; they share one combined LLM call per context
+        self.security_analyzer = CombinedSecurityAnalyzer()
+        self.key_security_analyzer = KeySecurityAnalyzer(self.security_analyzer)
+        self.transaction_control_analyzer = TransactionControlAnalyzer(self.security_analyzer)
+        self.deception_detector = DeceptionDetector(self.security_analyzer)
+        self.capital_risk_analyzer = CapitalRiskAnalyzer(self.security_analyzer)
         self.trust_score_calculator = TrustScoreCalculator()
         self.ensemble_evaluator = EnsembleEvaluator()
 
         # Load prompts and templates
         self.templates = load_evaluation_templates()
 
+    @classmethod
+    def shared(cls, primary_provider: LLMProvider = LLMProvider.ANTHROPIC) -> "LLMJudge":
+        """Return the process-wide judge for a primary provider, creating it on first use.
+
+        Judges keep no per-evaluation state, so callers evaluating many agents
+        should reuse this one rather than constructing a judge per image,
+        which re-reads the environment and rebuilds providers and analyzers.
+        """
+        provider = LLMProvider(primary_provider)
+        with cls._shared_lock:
+            judge = cls._shared.get(provider)
+            if judge is None:
+                judge = cls._shared[provider] = cls(primary_provider=provider)
+            return judge
+
     def evaluate_agent_security(
         self,
         image_data: dict[str, Any],
@@ -90,37 +113,71 @@ class LLMJudge:
                 image_data, code_analysis, market_context
             )
 
-            # Stage 1: Critical Security Analysis
-            key_security = self.key_security_analyzer.analyze(
+            # Stages 1-3: key security, transaction controls, deception and
+            # capital risk all come from one combined call
+            sections = self.security_analyzer.analyze(
                 evaluation_context, self.primary_llm_provider
             )
-            transaction_controls = self.transaction_control_analyzer.analyze(
-                evaluation_context, self.primary_llm_provider
+
+            # Stage 4: Overall Trust Assessment
+            trust_result = self.trust_score_calculator.calculate_trust_assessment(
+                sections["key_security"],
+                sections["transaction_control"],
+                sections["deception_detection"],
+                sections["capital_risk"],
             )
 
-            # Stage 2: Behavioral Integrity Analysis
-            deception_analysis = self.deception_detector.analyze(
-                evaluation_context, self.primary_llm_provider
+            return trust_result
+
+        except Exception as e:
+            self.console.print(f"[red]Trust-focused evaluation failed: {e}[/red]")
+            # Return conservative fallback assessment
+            return self.trust_score_calculator.generate_fallback_trust_assessment(image_data)
+
+    async def evaluate_agent_security_async(
+        self,
+        image_data: dict[str, Any],
+        code_analysis: dict[str, Any] | None = None,
+        market_context: dict[str, Any] | None = None,
+    ) -> TrustFocusedResult:
+        """
+        Perform trust-focused security evaluation without blocking the loop.
+
+        The four analyses share a single combined LLM call for the
+        evaluation context.
+
+        Args:
+            image_data: Docker image analysis results
+            code_analysis: Static code analysis results (if available)
+            market_context: Current market conditions and context
+
+        Returns:
+            Trust-focused security evaluation result
+        """
+        self.console.print("[blue]🔐 Starting trust-focused security evaluation...[/blue]")
+
+        try:
+            evaluation_context = prepare_evaluation_context(
+                image_data, code_analysis, market_context
             )
 
-            # Stage 3: Capital Risk Assessment
-            capital_risk = self.capital_risk_analyzer.analyze(
+            sections = await self.security_analyzer.analyze_async(
                 evaluation_context, self.primary_llm_provider
             )
 
-            # Stage 4: Overall Trust Assessment
-            trust_result = self.trust_score_calculator.calculate_trust_assessment(
-                key_security, transaction_controls, deception_analysis, capital_risk
+            return self.trust_score_calculator.calculate_trust_assessment(
+                sections["key_security"],
+                sections["transaction_control"],
+                sections["deception_detection"],
+                sections["capital_risk"],
             )
 
-            return trust_result
-
         except Exception as e:
             self.console.print(f"[red]Trust-focused evaluation failed: {e}[/red]")
             # Return conservative fallback assessment
             return self.trust_score_calculator.generate_fallback_trust_assessment(image_data)
 
-    def evaluate_agent(
+    async def evaluate_agent_async(
         self,
         image_data: dict[str, Any],
         code_analysis: dict[str, Any] | None = None,
@@ -129,6 +186,9 @@ class LLMJudge:
         """
         Perform comprehensive LLM-based agent evaluation.
 
+        In ensemble mode the primary and fallback providers are queried
+        concurrently.
+
         Args:
             image_data: Docker image analysis results
             code_analysis: Static code analysis results (if available)
@@ -139,27 +199,142 @@ class LLMJudge:
         """
         self.console.print("[blue]🧠 Starting LLM-based agent evaluation...[/blue]")
 
+        # One timestamp for the context and every result of this evaluation
+        now = datetime.now()
+
         try:
             # Prepare evaluation context
             evaluation_context = prepare_evaluation_context(
-                image_data, code_analysis, market_context
-            )
-
-            # Run primary evaluation
-            primary_result = self.ensemble_evaluator.run_evaluation(
-                evaluation_context, self.primary_llm_provider
+                image_data, code_analysis, market_context, now=now
             )
 
-            # Run ensemble evaluation if enabled
+            # Run primary and ensemble evaluations together if enabled
             if self.enable_ensemble and self.fallback_llm_provider:
-                ensemble_result = self.ensemble_evaluator.run_ensemble_evaluation(
-                    evaluation_context, primary_result, self.fallback_llm_provider
+                return await self.ensemble_evaluator.run_ensemble_evaluation_async(
+                    evaluation_context,
+                    self.primary_llm_provider,
+                    self.fallback_llm_provider,
+                    now=now,
                 )
-                return ensemble_result
 
-            return primary_result
+            return await self.ensemble_evaluator.run_evaluation_async(
+                evaluation_context, self.primary_llm_provider, now=now
+            )
 
         except Exception as e:
             self.console.print(f"[red]LLM evaluation failed: {e}[/red]")
             # Return conservative fallback assessment
-            return self.ensemble_evaluator._generate_fallback_assessment(image_data)
+            return self.ensemble_evaluator._generate_fallback_assessment(
+                image_data, now=now
+            )
+
+    async def warm_up_async(self) -> None:
+        """Open provider connections before a run of evaluations.
+
+        Call from the event loop that will run the evaluations, since pooled
+        connections belong to that loop.
+        """
+        providers = [self.primary_llm_provider, self.fallback_llm_provider]
+        await asyncio.gather(
+            *(provider.warm_up() for provider in providers if provider is not None)
+        )
+
+    def evaluate_agent(
+        self,
+        image_data: dict[str, Any],
+        code_analysis: dict[str, Any] | None = None,
+        market_context: dict[str, Any] | None = None,
+    ) -> LLMJudgeResult:
+        """Synchronous wrapper around evaluate_agent_async.
+
+        Must not be called from a running event loop; async callers should
+        await evaluate_agent_async directly.
+        """
+        return run_sync(
+            self.evaluate_agent_async(image_data, code_analysis, market_context)
+        )
+
+    async def evaluate_agents_async(
+        self,
+        images: list[dict[str, Any]],
+        market_context: dict[str, Any] | None = None,
+        max_concurrency: int | None = None,
+    ) -> list[LLMJudgeResult]:
+        """
+        Evaluate several agents concurrently.
+
+        Args:
+            images: Docker image analysis results, one per agent
+            market_context: Market conditions shared by all evaluations
+            max_concurrency: Maximum evaluations in flight, defaults to the
+                LLM_MAX_CONCURRENCY environment variable (8)
+
+        Returns:
+            Evaluation results in the order of ``images``. Failed evaluations
+            yield the conservative fallback assessment.
+        """
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def evaluate_one(image_data: dict[str, Any]) -> LLMJudgeResult:
+            async with semaphore:
+                return await self.evaluate_agent_async(
+                    image_data, market_context=market_context
+                )
+
+        return await asyncio.gather(*(evaluate_one(image) for image in images))
+
+    def evaluate_agents(
+        self,
+        images: list[dict[str, Any]],
+        market_context: dict[str, Any] | None = None,
+        max_concurrency: int | None = None,
+    ) -> list[LLMJudgeResult]:
+        """Synchronous wrapper around evaluate_agents_async."""
+        return run_sync(
+            self.evaluate_agents_async(images, market_context, max_concurrency)
+        )
+
+    async def evaluate_agents_batch_async(
+        self,
+        images: list[dict[str, Any]],
+        market_context: dict[str, Any] | None = None,
+    ) -> list[LLMJudgeResult]:
+        """
+        Evaluate several agents through the primary provider's batch API.
+
+        Batch jobs are billed at a discount but can take minutes to complete,
+        which suits bulk verification runs. Ensemble mode is not applied;
+        use evaluate_agents_async for real-time results.
+
+        Args:
+            images: Docker image analysis results, one per agent
+            market_context: Market conditions shared by all evaluations
+
+        Returns:
+            Evaluation results in the order of ``images``
+        """
+        now = datetime.now()
+        try:
+            contexts = [
+                prepare_evaluation_context(image_data, None, market_context, now=now)
+                for image_data in images
+            ]
+            return await self.ensemble_evaluator.run_batch_evaluation_async(
+                contexts, self.primary_llm_provider, now=now
+            )
+        except Exception as e:
+            self.console.print(f"[red]Batch LLM evaluation failed: {e}[/red]")
+            return [
+                self.ensemble_evaluator._generate_fallback_assessment(image_data, now=now)
+                for image_data in images
+            ]
+
+    def evaluate_agents_batch(
+        self,
+        images: list[dict[str, Any]],
+        market_context: dict[str, Any] | None = None,
+    ) -> list[LLMJudgeResult]:
+        """Synchronous wrapper around evaluate_agents_batch_async."""
+        return run_sync(self.evaluate_agents_batch_async(images, market_context))
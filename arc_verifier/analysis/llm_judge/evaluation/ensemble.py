@@ -1,11 +1,17 @@
 """Ensemble evaluation combining multiple LLM assessments."""
 
+import asyncio
+import hashlib
 import json
-import re
+import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 from typing import Any
 
-from rich.console import Console
+import numpy as np
+from pydantic import ValidationError
 
 from ..models import (
     AgentIntentClassification,
@@ -13,31 +19,201 @@ from ..models import (
     LLMJudgeResult,
     RiskAssessment,
 )
-from ..providers.base import BaseLLMProvider
-from .prompts import build_evaluation_prompt
+from ..providers.anthropic import MOCK_RESPONSE as ANTHROPIC_MOCK_RESPONSE
+from ..providers.base import BaseLLMProvider, run_sync
+from ..providers.openai import MOCK_RESPONSE as OPENAI_MOCK_RESPONSE
+from ..utils import console, extract_json_block, json_loads
+from .prompts import EVALUATION_SYSTEM_PROMPT, build_evaluation_prompt
+
+# Values for optional response fields the LLM may leave out
+_RESPONSE_DEFAULTS = {
+    "behavioral_flags": [],
+    "score_adjustments": {},
+    "confidence_level": 0.5,
+    "reasoning": "",
+    "trust_recommendation": "CAUTION",
+    "critical_issues": [],
+}
+
+_RESPONSE_PARSE_ERRORS = (json.JSONDecodeError, KeyError, TypeError, ValidationError)
+
+# Numerical fields averaged when combining evaluations
+_CODE_QUALITY_SCORES = (
+    "architecture_score",
+    "error_handling_score",
+    "security_practices_score",
+    "maintainability_score",
+    "test_coverage_score",
+    "overall_score",
+)
+_RISK_SCORES = (
+    "volatility_sensitivity",
+    "systemic_risk_score",
+    "market_impact_score",
+    "operational_risk_score",
+    "regulatory_risk_score",
+)
+
+
+def _decode_response_text(response: str, now: datetime) -> LLMJudgeResult:
+    """Extract, parse and validate the JSON result in an LLM response."""
+    # Extract the fenced JSON block, or parse the entire response as JSON
+    response_data = json_loads(extract_json_block(response))
+
+    # Validate the nested result in a single pass
+    return LLMJudgeResult.model_validate(
+        {**_RESPONSE_DEFAULTS, **response_data, "timestamp": now}
+    )
+
+
+_MOCK_RESULTS = {
+    response: _decode_response_text(response, datetime.now())
+    for response in (ANTHROPIC_MOCK_RESPONSE, OPENAI_MOCK_RESPONSE)
+}
 
 
 class EnsembleEvaluator:
     """Evaluator that combines multiple LLM assessments."""
 
+    # Parsed results keyed by provider and prompt hash, shared by all
+    # evaluators so repeated verifications of an image skip the API call
+    _result_cache: "OrderedDict[str, tuple[float, LLMJudgeResult]]" = OrderedDict()
+    _result_cache_lock = threading.Lock()
+    _result_cache_max_entries = 256
+
     def __init__(self):
-        self.console = Console()
+        self.console = console
+        self.cache_ttl = float(os.getenv("LLM_CACHE_TTL_SECONDS", "3600"))
+        # Primary results at least this confident skip the secondary model
+        self.confidence_threshold = float(
+            os.getenv("LLM_ENSEMBLE_CONFIDENCE_THRESHOLD", "0.9")
+        )
 
-    def run_evaluation(
+    async def run_evaluation_async(
         self,
         context: dict[str, Any],
-        provider: BaseLLMProvider
+        provider: BaseLLMProvider,
+        now: datetime | None = None,
     ) -> LLMJudgeResult:
-        """Run evaluation using specified LLM provider."""
+        """Run evaluation using specified LLM provider.
+
+        ``now`` timestamps the result; it defaults to the current time.
+        """
+        now = now or datetime.now()
 
         # Construct evaluation prompt
         prompt = build_evaluation_prompt(context)
 
+        cache_key = self._result_cache_key(provider, prompt)
+        cached = self._get_cached_result(cache_key)
+        if cached is not None:
+            return cached
+
         # Get LLM response
-        response = provider.call_llm(prompt)
+        response = await provider.call_llm_async(prompt, EVALUATION_SYSTEM_PROMPT)
 
         # Parse and validate response
-        return self._parse_llm_response(response, context)
+        try:
+            result = self._decode_llm_response(response, now)
+        except _RESPONSE_PARSE_ERRORS as e:
+            self.console.print(f"[red]Failed to parse LLM response: {e}[/red]")
+            return self._generate_fallback_assessment(context, now)
+
+        self._store_cached_result(cache_key, response, result)
+        return result
+
+    def run_evaluation(
+        self,
+        context: dict[str, Any],
+        provider: BaseLLMProvider,
+        now: datetime | None = None,
+    ) -> LLMJudgeResult:
+        """Synchronous wrapper around run_evaluation_async."""
+        return run_sync(self.run_evaluation_async(context, provider, now))
+
+    async def run_batch_evaluation_async(
+        self,
+        contexts: list[dict[str, Any]],
+        provider: BaseLLMProvider,
+        now: datetime | None = None,
+    ) -> list[LLMJudgeResult]:
+        """Evaluate several contexts with one provider batch request.
+
+        Cached results are reused and only the remaining prompts are
+        submitted. Missing or unparseable responses yield the fallback
+        assessment.
+        """
+        now = now or datetime.now()
+
+        prompts = [build_evaluation_prompt(context) for context in contexts]
+        cache_keys = [self._result_cache_key(provider, prompt) for prompt in prompts]
+        results = [self._get_cached_result(cache_key) for cache_key in cache_keys]
+
+        pending = {
+            str(index): prompts[index]
+            for index, result in enumerate(results)
+            if result is None
+        }
+        if pending:
+            responses = await provider.call_llm_batch_async(pending, EVALUATION_SYSTEM_PROMPT)
+            for custom_id in pending:
+                index = int(custom_id)
+                if custom_id not in responses:
+                    results[index] = self._generate_fallback_assessment(contexts[index], now)
+                    continue
+                try:
+                    result = self._decode_llm_response(responses[custom_id], now)
+                except _RESPONSE_PARSE_ERRORS as e:
+                    self.console.print(f"[red]Failed to parse LLM response: {e}[/red]")
+                    results[index] = self._generate_fallback_assessment(contexts[index], now)
+                    continue
+                self._store_cached_result(cache_keys[index], responses[custom_id], result)
+                results[index] = result
+
+        return results
+
+    async def run_ensemble_evaluation_async(
+        self,
+        context: dict[str, Any],
+        primary_provider: BaseLLMProvider,
+        fallback_provider: BaseLLMProvider | None = None,
+        now: datetime | None = None,
+    ) -> LLMJudgeResult:
+        """Run primary and secondary evaluations concurrently and combine them.
+
+        A failed primary evaluation is raised to the caller; a failed
+        secondary evaluation falls back to the primary result. When the
+        primary result is confident enough the secondary call is cancelled.
+        """
+        now = now or datetime.now()
+        if not fallback_provider:
+            return await self.run_evaluation_async(context, primary_provider, now)
+
+        secondary_task = asyncio.create_task(
+            self.run_evaluation_async(context, fallback_provider, now)
+        )
+        try:
+            primary_result = await self.run_evaluation_async(
+                context, primary_provider, now
+            )
+        except BaseException:
+            await self._cancel_task(secondary_task)
+            raise
+
+        if primary_result.confidence_level >= self.confidence_threshold:
+            await self._cancel_task(secondary_task)
+            return primary_result
+
+        secondary_result, = await asyncio.gather(
+            secondary_task, return_exceptions=True
+        )
+        return self._finish_ensemble(primary_result, secondary_result, now)
+
+    @staticmethod
+    async def _cancel_task(task: asyncio.Task) -> None:
+        """Cancel a task and wait for it, discarding its result or error."""
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
 
     def run_ensemble_evaluation(
         self,
@@ -46,12 +222,33 @@ class EnsembleEvaluator:
         fallback_provider: BaseLLMProvider | None = None
     ) -> LLMJudgeResult:
         """Run ensemble evaluation with multiple models."""
-        if not fallback_provider:
+        if (
+            not fallback_provider
+            or primary_result.confidence_level >= self.confidence_threshold
+        ):
             return primary_result
 
         try:
-            # Get secondary evaluation
-            secondary_result = self.run_evaluation(context, fallback_provider)
+            secondary_result = self.run_evaluation(
+                context, fallback_provider, primary_result.timestamp
+            )
+        except Exception as e:
+            secondary_result = e
+
+        return self._finish_ensemble(
+            primary_result, secondary_result, primary_result.timestamp
+        )
+
+    def _finish_ensemble(
+        self,
+        primary_result: LLMJudgeResult,
+        secondary_result: LLMJudgeResult | BaseException,
+        now: datetime,
+    ) -> LLMJudgeResult:
+        """Combine the primary result with the secondary result or its error."""
+        try:
+            if isinstance(secondary_result, BaseException):
+                raise secondary_result
 
             # Combine results using weighted averaging
             ensemble_result = self._combine_evaluations(
@@ -59,6 +256,7 @@ class EnsembleEvaluator:
                 secondary_result,
                 primary_weight=0.7,
                 secondary_weight=0.3,
+                now=now,
             )
 
             self.console.print("[green]✓ Ensemble evaluation completed[/green]")
@@ -70,38 +268,78 @@ class EnsembleEvaluator:
             )
             return primary_result
 
+    def _result_cache_key(self, provider: BaseLLMProvider, prompt: str) -> str:
+        """Build the result cache key for a provider and prompt."""
+        digest = hashlib.sha256(
+            f"{EVALUATION_SYSTEM_PROMPT}\n{prompt}".encode("utf-8")
+        ).hexdigest()
+        return f"{provider.provider_type.value}:{digest}"
+
+    def _get_cached_result(self, cache_key: str) -> LLMJudgeResult | None:
+        """Return a cached result if present and not expired.
+
+        Results are frozen, so the cached instance is shared with callers.
+        """
+        if self.cache_ttl <= 0:
+            return None
+
+        with self._result_cache_lock:
+            entry = self._result_cache.get(cache_key)
+            if entry is None:
+                return None
+
+            stored_at, result = entry
+            if time.monotonic() - stored_at > self.cache_ttl:
+                del self._result_cache[cache_key]
+                return None
+
+            self._result_cache.move_to_end(cache_key)
+
+        return result
+
+    def _store_cached_result(
+        self, cache_key: str, response: str, result: LLMJudgeResult
+    ) -> None:
+        """Cache a parsed result, evicting the least recently used entries.
+
+        Providers answer with their canned mock response when no API key is
+        set or the call failed, so those results are never cached: a later
+        call must reach the API again. Fallback assessments for unparseable
+        responses never get here.
+        """
+        if self.cache_ttl <= 0 or response in _MOCK_RESULTS:
+            return
+
+        with self._result_cache_lock:
+            self._result_cache[cache_key] = (time.monotonic(), result)
+            self._result_cache.move_to_end(cache_key)
+            while len(self._result_cache) > self._result_cache_max_entries:
+                self._result_cache.popitem(last=False)
+
     def _parse_llm_response(
-        self, response: str, context: dict[str, Any]
+        self, response: str, context: dict[str, Any], now: datetime | None = None
     ) -> LLMJudgeResult:
         """Parse and validate LLM response."""
+        now = now or datetime.now()
         try:
-            # Extract JSON from response
-            json_match = re.search(r"```json\s*(\{.*?\})\s*```", response, re.DOTALL)
-            if json_match:
-                response_data = json.loads(json_match.group(1))
-            else:
-                # Try to parse entire response as JSON
-                response_data = json.loads(response)
-
-            # Validate and construct result
-            return LLMJudgeResult(
-                intent_classification=AgentIntentClassification(
-                    **response_data["intent_classification"]
-                ),
-                code_quality=CodeQualityAnalysis(**response_data["code_quality"]),
-                risk_assessment=RiskAssessment(**response_data["risk_assessment"]),
-                behavioral_flags=response_data.get("behavioral_flags", []),
-                score_adjustments=response_data.get("score_adjustments", {}),
-                confidence_level=response_data.get("confidence_level", 0.5),
-                reasoning=response_data.get("reasoning", ""),
-                trust_recommendation=response_data.get("trust_recommendation", "CAUTION"),
-                critical_issues=response_data.get("critical_issues", []),
-                timestamp=datetime.now(),
-            )
+            return self._decode_llm_response(response, now)
 
-        except (json.JSONDecodeError, KeyError, TypeError) as e:
+        except _RESPONSE_PARSE_ERRORS as e:
             self.console.print(f"[red]Failed to parse LLM response: {e}[/red]")
-            return self._generate_fallback_assessment(context)
+            return self._generate_fallback_assessment(context, now)
+
+    def _decode_llm_response(
+        self, response: str, now: datetime | None = None
+    ) -> LLMJudgeResult:
+        """Decode an LLM response into a result, raising if it is malformed."""
+        now = now or datetime.now()
+
+        # Canned mock responses are decoded once at import
+        mock_result = _MOCK_RESULTS.get(response)
+        if mock_result is not None:
+            return mock_result.model_copy(update={"timestamp": now})
+
+        return _decode_response_text(response, now)
 
     def _combine_evaluations(
         self,
@@ -109,40 +347,30 @@ class EnsembleEvaluator:
         secondary: LLMJudgeResult,
         primary_weight: float = 0.7,
         secondary_weight: float = 0.3,
+        now: datetime | None = None,
     ) -> LLMJudgeResult:
         """Combine multiple LLM evaluations using weighted averaging."""
 
-        # Weighted average for numerical scores
-        def weighted_avg(p_val: float, s_val: float) -> float:
-            return primary_weight * p_val + secondary_weight * s_val
+        # Weighted average of every numerical score in one vector operation
+        adjustment_keys = list(
+            dict.fromkeys([*primary.score_adjustments, *secondary.score_adjustments])
+        )
+        combined = (
+            primary_weight * self._score_vector(primary, adjustment_keys)
+            + secondary_weight * self._score_vector(secondary, adjustment_keys)
+        ).tolist()
 
-        # Combine code quality scores
-        combined_code_quality = CodeQualityAnalysis(
-            architecture_score=weighted_avg(
-                primary.code_quality.architecture_score,
-                secondary.code_quality.architecture_score,
-            ),
-            error_handling_score=weighted_avg(
-                primary.code_quality.error_handling_score,
-                secondary.code_quality.error_handling_score,
-            ),
-            security_practices_score=weighted_avg(
-                primary.code_quality.security_practices_score,
-                secondary.code_quality.security_practices_score,
-            ),
-            maintainability_score=weighted_avg(
-                primary.code_quality.maintainability_score,
-                secondary.code_quality.maintainability_score,
-            ),
-            test_coverage_score=weighted_avg(
-                primary.code_quality.test_coverage_score,
-                secondary.code_quality.test_coverage_score,
-            ),
-            overall_score=weighted_avg(
-                primary.code_quality.overall_score, secondary.code_quality.overall_score
+        code_quality_end = len(_CODE_QUALITY_SCORES)
+        risk_end = code_quality_end + len(_RISK_SCORES)
+
+        # Both inputs are validated results and the combination only averages
+        # their floats, so the combined models skip re-validation
+        combined_code_quality = CodeQualityAnalysis.model_construct(
+            **dict(
+                zip(_CODE_QUALITY_SCORES, combined[:code_quality_end], strict=True)
             ),
             key_findings=list(
-                set(
+                dict.fromkeys(
                     primary.code_quality.key_findings
                     + secondary.code_quality.key_findings
                 )
@@ -150,38 +378,19 @@ class EnsembleEvaluator:
         )
 
         # Combine risk assessment
-        combined_risk = RiskAssessment(
-            volatility_sensitivity=weighted_avg(
-                primary.risk_assessment.volatility_sensitivity,
-                secondary.risk_assessment.volatility_sensitivity,
+        combined_risk = RiskAssessment.model_construct(
+            **dict(
+                zip(_RISK_SCORES, combined[code_quality_end:risk_end], strict=True)
             ),
             liquidity_requirements=primary.risk_assessment.liquidity_requirements,  # Use primary
-            systemic_risk_score=weighted_avg(
-                primary.risk_assessment.systemic_risk_score,
-                secondary.risk_assessment.systemic_risk_score,
-            ),
-            market_impact_score=weighted_avg(
-                primary.risk_assessment.market_impact_score,
-                secondary.risk_assessment.market_impact_score,
-            ),
-            operational_risk_score=weighted_avg(
-                primary.risk_assessment.operational_risk_score,
-                secondary.risk_assessment.operational_risk_score,
-            ),
-            regulatory_risk_score=weighted_avg(
-                primary.risk_assessment.regulatory_risk_score,
-                secondary.risk_assessment.regulatory_risk_score,
-            ),
         )
 
+        combined_confidence = combined[risk_end]
+
         # Combine score adjustments
-        combined_adjustments = {}
-        for key in set(primary.score_adjustments.keys()).union(
-            secondary.score_adjustments.keys()
-        ):
-            p_val = primary.score_adjustments.get(key, 0)
-            s_val = secondary.score_adjustments.get(key, 0)
-            combined_adjustments[key] = weighted_avg(p_val, s_val)
+        combined_adjustments = dict(
+            zip(adjustment_keys, combined[risk_end + 1:], strict=True)
+        )
 
         # Combine trust recommendations (conservative approach)
         trust_recommendations = [primary.trust_recommendation, secondary.trust_recommendation]
@@ -193,26 +402,40 @@ class EnsembleEvaluator:
             combined_trust = "DEPLOY"
 
         # Combine critical issues
-        combined_critical_issues = list(set(primary.critical_issues + secondary.critical_issues))
+        combined_critical_issues = list(
+            dict.fromkeys(primary.critical_issues + secondary.critical_issues)
+        )
 
-        return LLMJudgeResult(
+        return LLMJudgeResult.model_construct(
             intent_classification=primary.intent_classification,  # Use primary
             code_quality=combined_code_quality,
             risk_assessment=combined_risk,
             behavioral_flags=list(
-                set(primary.behavioral_flags + secondary.behavioral_flags)
+                dict.fromkeys(primary.behavioral_flags + secondary.behavioral_flags)
             ),
             score_adjustments=combined_adjustments,
-            confidence_level=weighted_avg(
-                primary.confidence_level, secondary.confidence_level
-            ),
+            confidence_level=combined_confidence,
             reasoning=f"Ensemble evaluation:\n\nPrimary: {primary.reasoning}\n\nSecondary: {secondary.reasoning}",
             trust_recommendation=combined_trust,
             critical_issues=combined_critical_issues,
-            timestamp=datetime.now(),
+            timestamp=now or datetime.now(),
         )
 
-    def _generate_fallback_assessment(self, context: dict[str, Any]) -> LLMJudgeResult:
+    def _score_vector(
+        self, result: LLMJudgeResult, adjustment_keys: list[str]
+    ) -> np.ndarray:
+        """Flatten a result's numerical scores in _combine_evaluations order."""
+        return np.array(
+            [getattr(result.code_quality, field) for field in _CODE_QUALITY_SCORES]
+            + [getattr(result.risk_assessment, field) for field in _RISK_SCORES]
+            + [result.confidence_level]
+            + [result.score_adjustments.get(key, 0) for key in adjustment_keys],
+            dtype=float,
+        )
+
+    def _generate_fallback_assessment(
+        self, context: dict[str, Any], now: datetime | None = None
+    ) -> LLMJudgeResult:
         """Generate conservative fallback assessment when LLM evaluation fails."""
         return LLMJudgeResult(
             intent_classification=AgentIntentClassification(
@@ -244,5 +467,5 @@ class EnsembleEvaluator:
             reasoning="LLM evaluation failed. Conservative assessment applied. Manual review strongly recommended.",
             trust_recommendation="DO_NOT_DEPLOY",  # Conservative fallback
             critical_issues=["LLM security evaluation failed - manual security audit required"],
-            timestamp=datetime.now(),
+            timestamp=now or datetime.now(),
         )
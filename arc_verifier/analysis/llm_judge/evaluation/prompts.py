@@ -1,37 +1,20 @@
 """General evaluation prompt templates."""
 
+import string
 from typing import Any
 
+from ..utils import format_agent_patterns
 
-def build_evaluation_prompt(context: dict[str, Any]) -> str:
-    """Build trust-focused evaluation prompt for LLM."""
-
-    def format_agent_patterns(patterns: dict[str, list[str]]) -> str:
-        """Format agent patterns for prompt inclusion."""
-        formatted = []
-        for category, items in patterns.items():
-            if items:
-                formatted.append(f"**{category.title()}:**")
-                for item in items[:3]:  # Limit to 3 items per category
-                    formatted.append(f"  - {item}")
-        return "\n".join(formatted) if formatted else "No specific patterns detected"
-
-    prompt = f"""
+# Static task framing, rubric and response schema. Sent as the system prompt
+# so providers can cache it across evaluations.
+EVALUATION_SYSTEM_PROMPT = """
 # Trust-Critical Agent Evaluation Task
 
 You are a security auditor evaluating if this autonomous agent can be trusted with user capital. Users will potentially trust this agent with $40k+ annually.
 
 **CORE QUESTION: Can this agent be trusted with real money?**
 
-## Agent Context
-- **Image**: {context['image_info']['tag']}
-- **Size**: {context['image_info']['size'] / 1024 / 1024:.1f} MB
-- **Layers**: {context['image_info']['layers']}
-- **Shade Agent Detected**: {context['image_info']['shade_agent_detected']}
-- **Vulnerabilities**: {context['image_info']['vulnerabilities']}
-
-## Agent Patterns Detected
-{format_agent_patterns(context.get('agent_patterns', {}))}
+The agent's context and detected patterns are provided in the user message.
 
 ## TRUST-FOCUSED EVALUATION REQUIREMENTS
 
@@ -109,14 +92,14 @@ Provide score adjustments (-50 to +50 points) for:
 
 Return your analysis in JSON format matching this structure:
 ```json
-{{
-  "intent_classification": {{
+{
+  "intent_classification": {
     "primary_strategy": "strategy_name",
     "risk_profile": "conservative|moderate|aggressive",
     "complexity_score": 0.0,
     "confidence": 0.0
-  }},
-  "code_quality": {{
+  },
+  "code_quality": {
     "architecture_score": 0.0,
     "error_handling_score": 0.0,
     "security_practices_score": 0.0,
@@ -124,29 +107,58 @@ Return your analysis in JSON format matching this structure:
     "test_coverage_score": 0.0,
     "overall_score": 0.0,
     "key_findings": ["finding1", "finding2"]
-  }},
-  "risk_assessment": {{
+  },
+  "risk_assessment": {
     "volatility_sensitivity": 0.0,
     "liquidity_requirements": "low|medium|high",
     "systemic_risk_score": 0.0,
     "market_impact_score": 0.0,
     "operational_risk_score": 0.0,
     "regulatory_risk_score": 0.0
-  }},
+  },
   "behavioral_flags": ["flag1", "flag2"],
-  "score_adjustments": {{
+  "score_adjustments": {
     "security_critical": 0.0,
     "deception_risk": 0.0,
     "capital_safety": 0.0,
     "transparency": 0.0
-  }},
+  },
   "confidence_level": 0.0,
   "reasoning": "Focus on trust-critical security concerns and specific vulnerabilities found...",
   "trust_recommendation": "DEPLOY|CAUTION|DO_NOT_DEPLOY",
   "critical_issues": ["List any critical security issues that must be fixed"]
-}}
+}
 ```
 
 **REMEMBER**: Users are trusting this agent with real money. Be thorough and paranoid about security.
-"""
-    return prompt.strip()
+""".strip()
+
+
+# Per-agent context rendered into the user message
+AGENT_CONTEXT_TEMPLATE = string.Template("""## Agent Context
+- **Image**: $tag
+- **Size**: $size_mb MB
+- **Layers**: $layers
+- **Shade Agent Detected**: $shade_agent_detected
+- **Vulnerabilities**: $vulnerabilities
+
+## Agent Patterns Detected
+$agent_patterns""")
+
+
+def build_evaluation_prompt(context: dict[str, Any]) -> str:
+    """Build the per-agent part of the trust-focused evaluation prompt.
+
+    Only the agent context is rendered per call; the task description and
+    response format are the constant EVALUATION_SYSTEM_PROMPT.
+    """
+    image_info = context['image_info']
+
+    return AGENT_CONTEXT_TEMPLATE.substitute(
+        tag=image_info['tag'],
+        size_mb=f"{image_info['size'] / 1024 / 1024:.1f}",
+        layers=image_info['layers'],
+        shade_agent_detected=image_info['shade_agent_detected'],
+        vulnerabilities=image_info['vulnerabilities'],
+        agent_patterns=format_agent_patterns(context.get('agent_patterns', {})),
+    )
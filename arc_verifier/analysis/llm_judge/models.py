@@ -3,7 +3,7 @@
 from datetime import datetime
 from enum import Enum
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class LLMProvider(str, Enum):
@@ -18,6 +18,8 @@ class LLMProvider(str, Enum):
 class AgentIntentClassification(BaseModel):
     """Agent intent classification result."""
 
+    model_config = ConfigDict(frozen=True)
+
     primary_strategy: str  # e.g., "arbitrage", "market_making", "yield_farming"
     risk_profile: str  # "conservative", "moderate", "aggressive"
     complexity_score: float  # 0.0 - 1.0
@@ -27,6 +29,8 @@ class AgentIntentClassification(BaseModel):
 class CodeQualityAnalysis(BaseModel):
     """Code quality evaluation result."""
 
+    model_config = ConfigDict(frozen=True)
+
     architecture_score: float  # 0.0 - 1.0
     error_handling_score: float  # 0.0 - 1.0
     security_practices_score: float  # 0.0 - 1.0
@@ -39,6 +43,8 @@ class CodeQualityAnalysis(BaseModel):
 class RiskAssessment(BaseModel):
     """Contextual risk assessment result."""
 
+    model_config = ConfigDict(frozen=True)
+
     volatility_sensitivity: float  # 0.0 - 1.0 (higher = more sensitive)
     liquidity_requirements: str  # "low", "medium", "high"
     systemic_risk_score: float  # 0.0 - 1.0 (higher = more systemic risk)
@@ -50,6 +56,8 @@ class RiskAssessment(BaseModel):
 class KeySecurityResult(BaseModel):
     """Private key security analysis result."""
 
+    model_config = ConfigDict(frozen=True)
+
     has_plaintext_keys: bool  # Critical security failure
     key_generation_secure: bool  # Generated in TEE/secure environment
     key_storage_encrypted: bool  # Keys encrypted at rest
@@ -62,6 +70,8 @@ class KeySecurityResult(BaseModel):
 class TransactionControlResult(BaseModel):
     """Transaction authorization control analysis."""
 
+    model_config = ConfigDict(frozen=True)
+
     has_spending_limits: bool  # Transaction amount limits
     has_approval_mechanisms: bool  # Multi-sig, time-locks, etc.
     emergency_stop_present: bool  # Circuit breaker mechanisms
@@ -74,6 +84,8 @@ class TransactionControlResult(BaseModel):
 class DeceptionDetectionResult(BaseModel):
     """Malicious pattern and deception detection."""
 
+    model_config = ConfigDict(frozen=True)
+
     backdoor_detected: bool  # Hidden admin access
     time_bomb_detected: bool  # Delayed activation logic
     obfuscated_code_found: bool  # Deliberately hidden logic
@@ -86,6 +98,8 @@ class DeceptionDetectionResult(BaseModel):
 class CapitalRiskResult(BaseModel):
     """Capital and financial risk assessment."""
 
+    model_config = ConfigDict(frozen=True)
+
     max_loss_bounded: bool  # Maximum possible loss is limited
     position_size_controls: bool  # Position sizing safeguards
     stop_loss_implemented: bool  # Automatic loss limits
@@ -98,6 +112,8 @@ class CapitalRiskResult(BaseModel):
 class TrustFocusedResult(BaseModel):
     """Trust-focused evaluation result for transaction agents."""
 
+    model_config = ConfigDict(frozen=True)
+
     can_trust_with_capital: bool  # Primary trust decision
     trust_score: float  # 0.0 - 1.0 overall trust score
     key_security: KeySecurityResult
@@ -113,6 +129,8 @@ class TrustFocusedResult(BaseModel):
 class LLMJudgeResult(BaseModel):
     """Complete LLM judge evaluation result."""
 
+    model_config = ConfigDict(frozen=True)
+
     intent_classification: AgentIntentClassification
     code_quality: CodeQualityAnalysis
     risk_assessment: RiskAssessment
@@ -1,58 +1,20 @@
 """Anthropic Claude provider implementation."""
 
 import os
+from typing import Any
 
 from ..models import LLMProvider
+from ..utils import json_dumps, json_loads
 from .base import BaseLLMProvider
+from .limits import ProviderUnavailableError
 
+MESSAGES_URL = "https://api.anthropic.com/v1/messages"
+BATCHES_URL = "https://api.anthropic.com/v1/messages/batches"
+MODEL = "claude-sonnet-4-20250514"
 
-class AnthropicProvider(BaseLLMProvider):
-    """Anthropic Claude provider implementation."""
-
-    def __init__(self):
-        super().__init__(LLMProvider.ANTHROPIC)
-
-    def call_llm(self, prompt: str) -> str:
-        """Call Anthropic Claude API."""
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if not api_key:
-            self.console.print(
-                "[yellow]ANTHROPIC_API_KEY not found, using mock response[/yellow]"
-            )
-            return self.generate_mock_response(prompt)
 
-        try:
-            response = self.client.post(
-                "https://api.anthropic.com/v1/messages",
-                headers={
-                    "Content-Type": "application/json",
-                    "x-api-key": api_key,
-                    "anthropic-version": "2023-06-01",
-                },
-                json={
-                    "model": "claude-sonnet-4-20250514",
-                    "max_tokens": int(os.getenv("LLM_MAX_TOKENS", "2048")),
-                    "messages": [{"role": "user", "content": prompt}],
-                },
-                timeout=float(os.getenv("LLM_TIMEOUT_SECONDS", "30")),
-            )
-            response.raise_for_status()
-
-            result = response.json()
-            return result["content"][0]["text"]
-
-        except Exception as e:
-            self.console.print(f"[red]Anthropic API call failed: {e}[/red]")
-            self.console.print("[yellow]Falling back to mock response[/yellow]")
-            return self.generate_mock_response(prompt)
-
-    def get_provider_name(self) -> str:
-        """Get the provider name."""
-        return "Anthropic Claude"
-
-    def generate_mock_response(self, prompt: str) -> str:
-        """Generate mock Anthropic response for development/testing."""
-        return """```json
+# Canned evaluation returned when no API key is configured
+MOCK_RESPONSE = """```json
 {
   "intent_classification": {
     "primary_strategy": "arbitrage",
@@ -90,3 +52,143 @@ class AnthropicProvider(BaseLLMProvider):
   "critical_issues": []
 }
 ```"""
+
+
+class AnthropicProvider(BaseLLMProvider):
+    """Anthropic Claude provider implementation."""
+
+    api_url = MESSAGES_URL
+
+    def __init__(self):
+        super().__init__(LLMProvider.ANTHROPIC)
+        # Settings are read once; create a new provider to pick up changes
+        self.api_key = os.getenv("ANTHROPIC_API_KEY")
+        self.headers = {
+            "Content-Type": "application/json",
+            "x-api-key": self.api_key or "",
+            "anthropic-version": "2023-06-01",
+        }
+
+    async def call_llm_async(self, prompt: str, system_prompt: str | None = None) -> str:
+        """Call Anthropic Claude API."""
+        if not self.api_key:
+            self.console.print(
+                "[yellow]ANTHROPIC_API_KEY not found, using mock response[/yellow]"
+            )
+            return self.generate_mock_response(prompt)
+
+        try:
+            return await self._stream_text(
+                MESSAGES_URL,
+                headers=self.headers,
+                payload={**self._build_payload(prompt, system_prompt), "stream": True},
+                extract_delta=self._extract_stream_text,
+            )
+
+        except ProviderUnavailableError:
+            # Surface the open circuit so callers can tell it from a real answer
+            raise
+        except Exception as e:
+            self.console.print(f"[red]Anthropic API call failed: {e}[/red]")
+            self.console.print("[yellow]Falling back to mock response[/yellow]")
+            return self.generate_mock_response(prompt)
+
+    async def call_llm_batch_async(
+        self, prompts: dict[str, str], system_prompt: str | None = None
+    ) -> dict[str, str]:
+        """Submit prompts as one Message Batches job at batch pricing.
+
+        Prompts the batch does not answer, including those cut off when a
+        batch running past LLM_BATCH_TIMEOUT_SECONDS is cancelled, or every
+        prompt if the batch cannot be run, fall back to real-time calls.
+        """
+        if not self.api_key or len(prompts) < 2:
+            return await super().call_llm_batch_async(prompts, system_prompt)
+
+        headers = self.headers
+        try:
+            response = await self.client.post(
+                BATCHES_URL,
+                headers=headers,
+                content=json_dumps({
+                    "requests": [
+                        {
+                            "custom_id": custom_id,
+                            "params": self._build_payload(prompt, system_prompt),
+                        }
+                        for custom_id, prompt in prompts.items()
+                    ]
+                }),
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            batch = await self._poll_batch(
+                f"{BATCHES_URL}/{response.json()['id']}",
+                headers,
+                lambda job: job.get("processing_status") == "ended",
+            )
+            results = await self.client.get(
+                batch["results_url"], headers=headers, timeout=self.timeout
+            )
+            results.raise_for_status()
+        except Exception as e:
+            self.console.print(f"[red]Anthropic batch failed: {e}[/red]")
+            return await super().call_llm_batch_async(prompts, system_prompt)
+
+        responses = {}
+        for line in results.text.splitlines():
+            if not line.strip():
+                continue
+            item = json_loads(line)
+            result = item.get("result", {})
+            if result.get("type") == "succeeded":
+                responses[item["custom_id"]] = "".join(
+                    block.get("text", "")
+                    for block in result["message"]["content"]
+                    if block.get("type") == "text"
+                )
+
+        missing = {
+            custom_id: prompt
+            for custom_id, prompt in prompts.items()
+            if custom_id not in responses
+        }
+        if missing:
+            responses.update(await super().call_llm_batch_async(missing, system_prompt))
+        return responses
+
+    def _build_payload(self, prompt: str, system_prompt: str | None) -> dict[str, Any]:
+        """Messages API request body, shared by real-time and batch calls."""
+        payload = {
+            "model": MODEL,
+            "max_tokens": self.max_tokens,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        if system_prompt:
+            # Mark the static instructions for ephemeral prompt caching
+            payload["system"] = [
+                {
+                    "type": "text",
+                    "text": system_prompt,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ]
+        return payload
+
+    @staticmethod
+    def _extract_stream_text(event: dict[str, Any]) -> str:
+        """Get the text fragment carried by a Messages API stream event."""
+        event_type = event.get("type")
+        if event_type == "content_block_delta":
+            return event["delta"].get("text", "")
+        if event_type == "error":
+            raise RuntimeError(event.get("error", {}).get("message", "stream error"))
+        return ""
+
+    def get_provider_name(self) -> str:
+        """Get the provider name."""
+        return "Anthropic Claude"
+
+    def generate_mock_response(self, prompt: str) -> str:
+        """Generate mock Anthropic response for development/testing."""
+        return MOCK_RESPONSE
@@ -1,31 +1,161 @@
 """Base class for LLM providers."""
 
+import asyncio
 import os
+import random
+import threading
+import time
+import weakref
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Coroutine
+from typing import Any, TypeVar
 
 import httpx
-from rich.console import Console
 
 from ..models import LLMProvider
+from ..utils import JSON_FENCE_RE, console, json_dumps, json_loads
+from .limits import CircuitBreaker, RateLimiter
+
+# Keep connections to the provider APIs alive between evaluations so
+# repeated calls skip the TCP/TLS handshake
+HTTP_LIMITS = httpx.Limits(
+    max_keepalive_connections=int(os.getenv("LLM_MAX_KEEPALIVE", "20")),
+    max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", "40")),
+    keepalive_expiry=85.0,
+)
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+
+# How long a cancelled batch job may take to wind down before giving up on it
+BATCH_CANCEL_GRACE_SECONDS = 120.0
+
+
+def is_outage(error: Exception) -> bool:
+    """Whether ``error`` suggests the provider is down rather than the request bad.
+
+    Only server errors, timeouts and network failures count towards the
+    circuit breaker; rate limiting and client errors mean the provider
+    answered.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, (httpx.TransportError, TimeoutError))
+
+T = TypeVar("T")
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion from synchronous code.
+
+    Each call gets a fresh event loop, so the pooled client it opens is
+    closed before the loop goes away rather than left for the garbage
+    collector with its connections still open.
+    """
+
+    async def main() -> T:
+        try:
+            return await coro
+        finally:
+            await BaseLLMProvider.aclose()
+
+    return asyncio.run(main())
 
 
 class BaseLLMProvider(ABC):
     """Abstract base class for LLM providers."""
 
+    # One pooled client per event loop, shared by every provider instance
+    _clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+        weakref.WeakKeyDictionary()
+    )
+    # Bound on in-flight requests per event loop, shared likewise
+    _semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+        weakref.WeakKeyDictionary()
+    )
+
+    # Request pacing and failure tracking, shared per provider type
+    _rate_limiters: dict[LLMProvider, RateLimiter] = {}
+    _circuit_breakers: dict[LLMProvider, CircuitBreaker] = {}
+    _limits_lock = threading.Lock()
+
+    # Set by providers that call a remote API
+    api_key: str | None = None
+    api_url: str | None = None
+
     def __init__(self, provider_type: LLMProvider):
         self.provider_type = provider_type
-        self.console = Console()
+        self.console = console
+        self.timeout = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+        self.max_tokens = int(os.getenv("LLM_MAX_TOKENS", "2048"))
+        self.max_retries = int(os.getenv("LLM_MAX_RETRIES", "4"))
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled async HTTP client for the running event loop.
+
+        Pooled connections belong to the loop that opened them, so each loop
+        (e.g. each ``run_sync`` from the synchronous wrappers) gets its own
+        client, shared by all providers running on it.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(timeout=self.timeout, limits=HTTP_LIMITS)
+            self._clients[loop] = client
+        return client
+
+    @property
+    def concurrency(self) -> asyncio.Semaphore:
+        """Semaphore bounding in-flight requests on the running event loop.
 
-        # Initialize HTTP client with timeout
-        timeout = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
-        self.client = httpx.Client(timeout=timeout)
+        Parallel sub-analyses, ensembles and batch fallbacks all draw from
+        this one pool rather than each opening as many requests as they like.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(int(os.getenv("LLM_MAX_PARALLEL_REQUESTS", "32")))
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """Token bucket pacing requests to this provider type.
+
+        Opt-in: requests are only paced when LLM_REQUESTS_PER_MINUTE is set
+        to a positive rate, e.g. to stay under an account's rate limit.
+        """
+        with self._limits_lock:
+            limiter = self._rate_limiters.get(self.provider_type)
+            if limiter is None:
+                limiter = RateLimiter(
+                    float(os.getenv("LLM_REQUESTS_PER_MINUTE", "0"))
+                )
+                self._rate_limiters[self.provider_type] = limiter
+        return limiter
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """Circuit breaker for consecutive failures of this provider type."""
+        with self._limits_lock:
+            breaker = self._circuit_breakers.get(self.provider_type)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    int(os.getenv("LLM_CIRCUIT_BREAKER_FAILURES", "5")),
+                    float(os.getenv("LLM_CIRCUIT_BREAKER_SECONDS", "60")),
+                )
+                self._circuit_breakers[self.provider_type] = breaker
+        return breaker
 
     @abstractmethod
-    def call_llm(self, prompt: str) -> str:
+    async def call_llm_async(self, prompt: str, system_prompt: str | None = None) -> str:
         """Call the LLM provider with the given prompt.
         
         Args:
             prompt: The prompt to send to the LLM
+            system_prompt: Optional static instructions, sent separately so
+                the provider can cache them across calls
             
         Returns:
             The LLM response as a string
@@ -35,6 +165,182 @@ class BaseLLMProvider(ABC):
         """
         pass
 
+    def call_llm(self, prompt: str, system_prompt: str | None = None) -> str:
+        """Synchronous wrapper around call_llm_async for non-async callers."""
+        return run_sync(self.call_llm_async(prompt, system_prompt))
+
+    async def _stream_text(
+        self,
+        url: str,
+        headers: dict[str, str],
+        payload: dict[str, Any],
+        extract_delta: Callable[[dict[str, Any]], str],
+    ) -> str:
+        """POST a streaming request and join the text deltas of its SSE events.
+
+        ``headers`` must declare the JSON content type of ``payload``.
+
+        Reading stops at the end of the stream, or as soon as the text holds a
+        complete fenced JSON block, which is all callers parse. Requests are
+        paced by the provider's rate limiter, if enabled, and refused with
+        ProviderUnavailableError while its circuit breaker is open.
+        Rate-limited and transiently failing requests are retried with
+        exponential backoff, up to LLM_MAX_RETRIES times.
+        """
+        self.circuit_breaker.check()
+
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire()
+            try:
+                async with self.concurrency:
+                    text = await self._read_stream(url, headers, payload, extract_delta)
+            except asyncio.CancelledError:
+                self.circuit_breaker.release()
+                raise
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    if is_outage(e):
+                        self.circuit_breaker.record_failure()
+                    else:
+                        self.circuit_breaker.release()
+                    raise
+                self.console.print(
+                    f"[yellow]{self.get_provider_name()} request failed ({e}), "
+                    f"retrying in {delay:.1f}s[/yellow]"
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            self.circuit_breaker.record_success()
+            return text
+
+    async def _read_stream(
+        self,
+        url: str,
+        headers: dict[str, str],
+        payload: dict[str, Any],
+        extract_delta: Callable[[dict[str, Any]], str],
+    ) -> str:
+        """Send one streaming request and collect its text deltas."""
+        parts: list[str] = []
+        async with self.client.stream(
+            "POST",
+            url,
+            headers=headers,
+            content=json_dumps(payload),
+            timeout=self.timeout,
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+
+                delta = extract_delta(json_loads(data))
+                if delta:
+                    parts.append(delta)
+                    if "`" in delta and JSON_FENCE_RE.search("".join(parts)):
+                        # Closing the response here drops its pooled connection,
+                        # which is cheaper than waiting for the trailing prose
+                        break
+        return "".join(parts)
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float | None:
+        """Seconds to wait before retrying after ``error``, or None to give up.
+
+        Only rate limiting, transient server errors and network failures are
+        retried; authentication and other client errors fail immediately.
+        A ``retry-after`` header from the provider takes precedence over
+        exponential backoff with jitter.
+        """
+        if attempt >= self.max_retries:
+            return None
+        if isinstance(error, httpx.HTTPStatusError):
+            if error.response.status_code not in RETRYABLE_STATUS_CODES:
+                return None
+            retry_after = error.response.headers.get("retry-after")
+            if retry_after:
+                try:
+                    return min(float(retry_after), 60.0)
+                except ValueError:
+                    pass
+        elif not isinstance(error, httpx.TransportError):
+            return None
+        return min(2.0 ** attempt, 30.0) + random.uniform(0, 1)
+
+    async def call_llm_batch_async(
+        self, prompts: dict[str, str], system_prompt: str | None = None
+    ) -> dict[str, str]:
+        """Call the LLM for several prompts keyed by caller-chosen ids.
+
+        The default makes concurrent real-time calls. Providers with a batch
+        API override this to submit the prompts as one discounted job.
+
+        Returns:
+            The response for every id in ``prompts`` whose call did not raise,
+            e.g. because the provider's circuit breaker is open
+        """
+        responses = await asyncio.gather(
+            *(self.call_llm_async(prompt, system_prompt) for prompt in prompts.values()),
+            return_exceptions=True,
+        )
+        answered = {}
+        for custom_id, response in zip(prompts, responses, strict=True):
+            if isinstance(response, BaseException):
+                self.console.print(
+                    f"[yellow]{self.get_provider_name()} call for {custom_id} failed: "
+                    f"{response}[/yellow]"
+                )
+                continue
+            answered[custom_id] = response
+        return answered
+
+    async def _poll_batch(
+        self,
+        url: str,
+        headers: dict[str, str],
+        is_finished: Callable[[dict[str, Any]], bool],
+    ) -> dict[str, Any]:
+        """Poll a batch job with exponential backoff until it finishes.
+
+        A job still running after LLM_BATCH_TIMEOUT_SECONDS is cancelled so
+        it stops running up cost, and is returned once the cancellation has
+        finished, carrying the results of the requests it completed.
+
+        Raises:
+            TimeoutError: If the cancelled job has not finished after
+                BATCH_CANCEL_GRACE_SECONDS
+        """
+        deadline = time.monotonic() + float(os.getenv("LLM_BATCH_TIMEOUT_SECONDS", "3600"))
+        delay = 5.0
+        cancelled = False
+        while True:
+            response = await self.client.get(url, headers=headers, timeout=self.timeout)
+            response.raise_for_status()
+            job = response.json()
+            if is_finished(job):
+                return job
+            if time.monotonic() + delay > deadline:
+                if cancelled:
+                    raise TimeoutError(f"batch job {url} did not finish cancelling in time")
+                self.console.print(
+                    f"[yellow]Batch job {url} did not finish in time, cancelling it[/yellow]"
+                )
+                cancel = await self.client.post(
+                    f"{url}/cancel", headers=headers, timeout=self.timeout
+                )
+                cancel.raise_for_status()
+                cancelled = True
+                deadline = time.monotonic() + BATCH_CANCEL_GRACE_SECONDS
+                delay = 5.0
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 60.0)
+
     @abstractmethod
     def get_provider_name(self) -> str:
         """Get the provider name for identification."""
@@ -45,7 +351,22 @@ class BaseLLMProvider(ABC):
         """Generate a mock response for testing/development."""
         pass
 
-    def __del__(self):
-        """Clean up HTTP client on deletion."""
-        if hasattr(self, 'client'):
-            self.client.close()
+    async def warm_up(self) -> None:
+        """Open a pooled connection to the provider ahead of the first call.
+
+        Any HTTP response means the TCP/TLS connection is up. Failures are
+        ignored since the first real call reports them.
+        """
+        if not self.api_key or not self.api_url:
+            return
+        try:
+            await self.client.head(self.api_url, timeout=self.timeout)
+        except httpx.HTTPError:
+            pass
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the pooled HTTP client for the running event loop."""
+        client = cls._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
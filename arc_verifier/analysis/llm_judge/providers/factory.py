@@ -7,6 +7,12 @@ from .anthropic import AnthropicProvider
 from .base import BaseLLMProvider
 from .openai import OpenAIProvider
 
+# Provider implementation for each supported provider type
+PROVIDER_CLASSES: dict[LLMProvider, type[BaseLLMProvider]] = {
+    LLMProvider.ANTHROPIC: AnthropicProvider,
+    LLMProvider.OPENAI: OpenAIProvider,
+}
+
 
 def create_provider(provider_type: LLMProvider | None = None) -> BaseLLMProvider:
     """Create an LLM provider instance based on type or environment.
@@ -25,12 +31,10 @@ def create_provider(provider_type: LLMProvider | None = None) -> BaseLLMProvider
         env_provider = os.getenv("LLM_PRIMARY_PROVIDER", "anthropic")
         provider_type = LLMProvider(env_provider)
 
-    if provider_type == LLMProvider.ANTHROPIC:
-        return AnthropicProvider()
-    elif provider_type == LLMProvider.OPENAI:
-        return OpenAIProvider()
-    else:
+    provider_cls = PROVIDER_CLASSES.get(provider_type)
+    if provider_cls is None:
         raise ValueError(f"Unsupported provider type: {provider_type}")
+    return provider_cls()
 
 
 def create_fallback_provider() -> BaseLLMProvider | None:
@@ -0,0 +1,105 @@
+"""Client-side rate limiting and circuit breaking for LLM providers."""
+
+import asyncio
+import threading
+import time
+
+
+class ProviderUnavailableError(RuntimeError):
+    """Raised instead of calling a provider whose circuit is open."""
+
+
+class RateLimiter:
+    """Token bucket allowing ``requests_per_minute`` calls with small bursts.
+
+    A non-positive rate disables limiting. The bucket is guarded by a
+    threading lock so it can be shared by the event loops of the
+    synchronous wrappers.
+    """
+
+    def __init__(self, requests_per_minute: float, burst: int = 4):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(burst)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token, returning how long the caller must wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        if self.rate <= 0:
+            return
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class CircuitBreaker:
+    """Stops calling a provider after repeated consecutive failures.
+
+    After ``failure_threshold`` failures in a row the circuit opens for
+    ``reset_seconds``. After that a single call is let through as a trial
+    while all others are still refused; the circuit closes if the trial
+    succeeds and re-opens if it fails.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def check(self) -> None:
+        """Raise ProviderUnavailableError while the circuit is open."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if (
+                self._trial_in_flight
+                or time.monotonic() - self._opened_at < self.reset_seconds
+            ):
+                raise ProviderUnavailableError(
+                    f"circuit open after {self._failures} consecutive failures"
+                )
+            # Half-open: this caller is the trial, everyone else waits on it
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit at the threshold."""
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or (
+                self.failure_threshold > 0 and self._failures >= self.failure_threshold
+            ):
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def release(self) -> None:
+        """End a call whose error says nothing about provider availability.
+
+        A trial ending this way leaves the circuit half-open for the next
+        caller to try.
+        """
+        with self._lock:
+            self._trial_in_flight = False
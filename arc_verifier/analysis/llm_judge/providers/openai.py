@@ -1,58 +1,22 @@
 """OpenAI GPT provider implementation."""
 
 import os
+from typing import Any
 
 from ..models import LLMProvider
+from ..utils import json_dumps, json_loads
 from .base import BaseLLMProvider
+from .limits import ProviderUnavailableError
 
+CHAT_COMPLETIONS_URL = "https://api.openai.com/v1/chat/completions"
+FILES_URL = "https://api.openai.com/v1/files"
+BATCHES_URL = "https://api.openai.com/v1/batches"
+MODEL = "gpt-4.1"
+BATCH_FINAL_STATUSES = frozenset(("completed", "failed", "expired", "cancelled"))
 
-class OpenAIProvider(BaseLLMProvider):
-    """OpenAI GPT provider implementation."""
-
-    def __init__(self):
-        super().__init__(LLMProvider.OPENAI)
-
-    def call_llm(self, prompt: str) -> str:
-        """Call OpenAI API."""
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            self.console.print(
-                "[yellow]OPENAI_API_KEY not found, using mock response[/yellow]"
-            )
-            return self.generate_mock_response(prompt)
-
-        try:
-            response = self.client.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {api_key}",
-                },
-                json={
-                    "model": "gpt-4.1",
-                    "max_tokens": int(os.getenv("LLM_MAX_TOKENS", "2048")),
-                    "messages": [{"role": "user", "content": prompt}],
-                    "temperature": 0.1,
-                },
-                timeout=float(os.getenv("LLM_TIMEOUT_SECONDS", "30")),
-            )
-            response.raise_for_status()
-
-            result = response.json()
-            return result["choices"][0]["message"]["content"]
 
-        except Exception as e:
-            self.console.print(f"[red]OpenAI API call failed: {e}[/red]")
-            self.console.print("[yellow]Falling back to mock response[/yellow]")
-            return self.generate_mock_response(prompt)
-
-    def get_provider_name(self) -> str:
-        """Get the provider name."""
-        return "OpenAI GPT"
-
-    def generate_mock_response(self, prompt: str) -> str:
-        """Generate mock OpenAI response for development/testing."""
-        return """```json
+# Canned evaluation returned when no API key is configured
+MOCK_RESPONSE = """```json
 {
   "intent_classification": {
     "primary_strategy": "arbitrage",
@@ -90,3 +54,153 @@ class OpenAIProvider(BaseLLMProvider):
   "critical_issues": []
 }
 ```"""
+
+
+class OpenAIProvider(BaseLLMProvider):
+    """OpenAI GPT provider implementation."""
+
+    api_url = CHAT_COMPLETIONS_URL
+
+    def __init__(self):
+        super().__init__(LLMProvider.OPENAI)
+        # Settings are read once; create a new provider to pick up changes
+        self.api_key = os.getenv("OPENAI_API_KEY")
+        self.headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key or ''}",
+        }
+
+    async def call_llm_async(self, prompt: str, system_prompt: str | None = None) -> str:
+        """Call OpenAI API."""
+        if not self.api_key:
+            self.console.print(
+                "[yellow]OPENAI_API_KEY not found, using mock response[/yellow]"
+            )
+            return self.generate_mock_response(prompt)
+
+        try:
+            return await self._stream_text(
+                CHAT_COMPLETIONS_URL,
+                headers=self.headers,
+                payload={**self._build_payload(prompt, system_prompt), "stream": True},
+                extract_delta=self._extract_stream_text,
+            )
+
+        except ProviderUnavailableError:
+            # Surface the open circuit so callers can tell it from a real answer
+            raise
+        except Exception as e:
+            self.console.print(f"[red]OpenAI API call failed: {e}[/red]")
+            self.console.print("[yellow]Falling back to mock response[/yellow]")
+            return self.generate_mock_response(prompt)
+
+    async def call_llm_batch_async(
+        self, prompts: dict[str, str], system_prompt: str | None = None
+    ) -> dict[str, str]:
+        """Submit prompts as one Batch API job at batch pricing.
+
+        Prompts the batch does not answer, including those cut off when a
+        batch running past LLM_BATCH_TIMEOUT_SECONDS is cancelled, or every
+        prompt if the batch cannot be run, fall back to real-time calls.
+        """
+        if not self.api_key or len(prompts) < 2:
+            return await super().call_llm_batch_async(prompts, system_prompt)
+
+        # The file upload is multipart, so only the auth header is shared
+        headers = {"Authorization": self.headers["Authorization"]}
+        requests = b"\n".join(
+            json_dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._build_payload(prompt, system_prompt),
+            })
+            for custom_id, prompt in prompts.items()
+        )
+        try:
+            upload = await self.client.post(
+                FILES_URL,
+                headers=headers,
+                data={"purpose": "batch"},
+                files={"file": ("batch.jsonl", requests, "application/jsonl")},
+                timeout=self.timeout,
+            )
+            upload.raise_for_status()
+            response = await self.client.post(
+                BATCHES_URL,
+                headers=headers,
+                json={
+                    "input_file_id": upload.json()["id"],
+                    "endpoint": "/v1/chat/completions",
+                    "completion_window": "24h",
+                },
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            batch = await self._poll_batch(
+                f"{BATCHES_URL}/{response.json()['id']}",
+                headers,
+                lambda job: job.get("status") in BATCH_FINAL_STATUSES,
+            )
+            if not batch.get("output_file_id"):
+                raise RuntimeError(f"batch {batch['id']} {batch.get('status')}")
+            results = await self.client.get(
+                f"{FILES_URL}/{batch['output_file_id']}/content",
+                headers=headers,
+                timeout=self.timeout,
+            )
+            results.raise_for_status()
+        except Exception as e:
+            self.console.print(f"[red]OpenAI batch failed: {e}[/red]")
+            return await super().call_llm_batch_async(prompts, system_prompt)
+
+        responses = {}
+        for line in results.text.splitlines():
+            if not line.strip():
+                continue
+            item = json_loads(line)
+            response = item.get("response") or {}
+            if response.get("status_code") == 200:
+                choices = response["body"].get("choices") or []
+                if choices:
+                    responses[item["custom_id"]] = choices[0]["message"].get("content") or ""
+
+        missing = {
+            custom_id: prompt
+            for custom_id, prompt in prompts.items()
+            if custom_id not in responses
+        }
+        if missing:
+            responses.update(await super().call_llm_batch_async(missing, system_prompt))
+        return responses
+
+    def _build_payload(self, prompt: str, system_prompt: str | None) -> dict[str, Any]:
+        """Chat completion request body, shared by real-time and batch calls."""
+        # A leading system message keeps the static prefix identical across
+        # calls, which OpenAI caches automatically
+        messages = [{"role": "user", "content": prompt}]
+        if system_prompt:
+            messages.insert(0, {"role": "system", "content": system_prompt})
+
+        return {
+            "model": MODEL,
+            "max_tokens": self.max_tokens,
+            "messages": messages,
+            "temperature": 0.1,
+        }
+
+    @staticmethod
+    def _extract_stream_text(event: dict[str, Any]) -> str:
+        """Get the text fragment carried by a chat completion stream chunk."""
+        choices = event.get("choices") or []
+        if not choices:
+            return ""
+        return (choices[0].get("delta") or {}).get("content") or ""
+
+    def get_provider_name(self) -> str:
+        """Get the provider name."""
+        return "OpenAI GPT"
+
+    def generate_mock_response(self, prompt: str) -> str:
+        """Generate mock OpenAI response for development/testing."""
+        return MOCK_RESPONSE
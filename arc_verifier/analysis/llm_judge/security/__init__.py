@@ -2,6 +2,7 @@
 
 from .analyzers import (
     CapitalRiskAnalyzer,
+    CombinedSecurityAnalyzer,
     DeceptionDetector,
     KeySecurityAnalyzer,
     TransactionControlAnalyzer,
@@ -13,5 +14,6 @@ __all__ = [
     "TransactionControlAnalyzer",
     "DeceptionDetector",
     "CapitalRiskAnalyzer",
+    "CombinedSecurityAnalyzer",
     "TrustScoreCalculator",
 ]
@@ -1,10 +1,14 @@
 """Trust-focused security analyzers."""
 
-import json
-import re
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
 from typing import Any
 
-from rich.console import Console
+from pydantic import BaseModel
 
 from ..models import (
     CapitalRiskResult,
@@ -13,268 +17,346 @@ from ..models import (
     TransactionControlResult,
 )
 from ..providers.base import BaseLLMProvider
-from .prompts import (
-    build_capital_risk_prompt,
-    build_deception_detection_prompt,
-    build_key_security_prompt,
-    build_transaction_control_prompt,
-)
+from ..utils import console, extract_json_block, json_loads
+from .prompts import SECURITY_SYSTEM_PROMPT, build_combined_security_prompt
 
 
-class SecurityAnalyzer:
-    """Base class for security analyzers."""
+def _decode_json(response: str) -> Any:
+    """Decode the fenced JSON block of an LLM response, or the whole text."""
+    return json_loads(extract_json_block(response))
 
-    def __init__(self):
-        self.console = Console()
 
+_TRUE_STRINGS = frozenset(("true", "yes", "1"))
+_FALSE_STRINGS = frozenset(("false", "no", "0"))
 
-class KeySecurityAnalyzer(SecurityAnalyzer):
-    """Analyzer for private key security patterns."""
-
-    def analyze(self, context: dict[str, Any], provider: BaseLLMProvider) -> KeySecurityResult:
-        """Analyze private key security patterns using LLM."""
 
-        prompt = build_key_security_prompt(context)
+def _parse_bool(value, conservative_default: bool) -> bool:
+    """Parse boolean-like values from LLM output."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        value = value.lower()
+        if value in _TRUE_STRINGS:
+            return True
+        elif value in _FALSE_STRINGS:
+            return False
+        else:  # "unknown", "unclear", etc.
+            return conservative_default
+    return conservative_default
 
-        try:
-            response = provider.call_llm(prompt)
-            return self._parse_response(response)
-        except Exception as e:
-            self.console.print(f"[yellow]Key security analysis failed: {e}[/yellow]")
-            return self._generate_fallback_result()
 
-    def _parse_response(self, response: str) -> KeySecurityResult:
-        """Parse LLM response for key security analysis."""
-        try:
-            json_match = re.search(r"```json\s*(\{.*?\})\s*```", response, re.DOTALL)
-            if json_match:
-                data = json.loads(json_match.group(1))
-            else:
-                data = json.loads(response)
-
-            # Helper function to parse boolean-like values from LLM
-            def parse_bool(value, conservative_default: bool) -> bool:
-                if isinstance(value, bool):
-                    return value
-                if isinstance(value, str):
-                    if value.lower() in ["true", "yes", "1"]:
-                        return True
-                    elif value.lower() in ["false", "no", "0"]:
-                        return False
-                    else:  # "unknown", "unclear", etc.
-                        return conservative_default
-                return conservative_default
-
-            return KeySecurityResult(
-                has_plaintext_keys=parse_bool(data.get("has_plaintext_keys"), True),  # Conservative: assume yes
-                key_generation_secure=parse_bool(data.get("key_generation_secure"), False),  # Conservative: assume no
-                key_storage_encrypted=parse_bool(data.get("key_storage_encrypted"), False),  # Conservative: assume no
-                key_rotation_implemented=parse_bool(data.get("key_rotation_implemented"), False),  # Conservative: assume no
-                key_exposure_risk=data.get("key_exposure_risk", "high"),
-                security_concerns=data.get("security_concerns", ["Unable to analyze"]),
-                code_references=data.get("code_references", [])
-            )
-        except Exception as e:
-            self.console.print(f"[yellow]Failed to parse key security response: {e}[/yellow]")
-            return self._generate_fallback_result()
-
-    def _generate_fallback_result(self) -> KeySecurityResult:
-        """Generate conservative fallback for key security analysis."""
-        return KeySecurityResult(
-            has_plaintext_keys=True,  # Conservative: assume worst case
-            key_generation_secure=False,
-            key_storage_encrypted=False,
-            key_rotation_implemented=False,
-            key_exposure_risk="critical",
-            security_concerns=["Analysis failed - manual security review required"],
-            code_references=[]
+class SecurityAnalyzer:
+    """Base class for security analyzers.
+
+    Subclasses are data: the combined-response section they read, the result
+    model they build, the conservative value for every result field when the
+    LLM omits or garbles it, and the frozen result returned when analysis
+    fails.
+    Boolean fields accept boolean-like strings from the LLM.
+    """
+
+    section: str
+    result_cls: type[BaseModel]
+    defaults: dict[str, Any]
+    # Shared by every failed analysis; never mutate it, including its lists
+    fallback: BaseModel
+
+    def __init__(self, combined: "CombinedSecurityAnalyzer | None" = None):
+        self.console = console
+        self.combined = combined if combined is not None else CombinedSecurityAnalyzer()
+
+    def analyze(self, context: dict[str, Any], provider: BaseLLMProvider) -> BaseModel:
+        """Return this analyzer's section of the combined security analysis."""
+        return self.combined.analyze(context, provider)[self.section]
+
+    async def analyze_async(
+        self, context: dict[str, Any], provider: BaseLLMProvider
+    ) -> BaseModel:
+        """Async version of analyze for use alongside the other analyzers."""
+        results = await self.combined.analyze_async(context, provider)
+        return results[self.section]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Split the field table once so parsing does no per-field type checks
+        cls._bool_defaults = tuple(
+            (name, default)
+            for name, default in cls.defaults.items()
+            if isinstance(default, bool)
+        )
+        cls._value_defaults = tuple(
+            (name, default)
+            for name, default in cls.defaults.items()
+            if not isinstance(default, bool)
         )
 
+    @classmethod
+    def _result_from_data(cls, data: dict[str, Any]) -> BaseModel:
+        """Build the result from decoded LLM output, defaulting conservatively."""
+        values = {
+            name: _parse_bool(data.get(name), default)
+            for name, default in cls._bool_defaults
+        }
+        for name, default in cls._value_defaults:
+            values[name] = data.get(name, default)
+        return cls.result_cls(**values)
 
-class TransactionControlAnalyzer(SecurityAnalyzer):
-    """Analyzer for transaction authorization controls."""
-
-    def analyze(self, context: dict[str, Any], provider: BaseLLMProvider) -> TransactionControlResult:
-        """Analyze transaction authorization controls using LLM."""
+    @classmethod
+    def _generate_fallback_result(cls) -> BaseModel:
+        """Return the conservative result used when analysis fails."""
+        return cls.fallback
 
-        prompt = build_transaction_control_prompt(context)
 
-        try:
-            response = provider.call_llm(prompt)
-            return self._parse_response(response)
-        except Exception as e:
-            self.console.print(f"[yellow]Transaction control analysis failed: {e}[/yellow]")
-            return self._generate_fallback_result()
+class KeySecurityAnalyzer(SecurityAnalyzer):
+    """Analyzer for private key security patterns."""
 
-    def _parse_response(self, response: str) -> TransactionControlResult:
-        """Parse LLM response for transaction control analysis."""
-        try:
-            json_match = re.search(r"```json\s*(\{.*?\})\s*```", response, re.DOTALL)
-            if json_match:
-                data = json.loads(json_match.group(1))
-            else:
-                data = json.loads(response)
-
-            # Helper function to parse boolean-like values from LLM
-            def parse_bool(value, conservative_default: bool) -> bool:
-                if isinstance(value, bool):
-                    return value
-                if isinstance(value, str):
-                    if value.lower() in ["true", "yes", "1"]:
-                        return True
-                    elif value.lower() in ["false", "no", "0"]:
-                        return False
-                    else:  # "unknown", "unclear", etc.
-                        return conservative_default
-                return conservative_default
-
-            return TransactionControlResult(
-                has_spending_limits=parse_bool(data.get("has_spending_limits"), False),  # Conservative: assume no
-                has_approval_mechanisms=parse_bool(data.get("has_approval_mechanisms"), False),  # Conservative: assume no
-                emergency_stop_present=parse_bool(data.get("emergency_stop_present"), False),  # Conservative: assume no
-                cross_chain_controls=parse_bool(data.get("cross_chain_controls"), False),  # Conservative: assume no
-                transaction_monitoring=parse_bool(data.get("transaction_monitoring"), False),  # Conservative: assume no
-                control_strength=data.get("control_strength", "weak"),
-                control_gaps=data.get("control_gaps", ["Unable to analyze"])
-            )
-        except Exception as e:
-            self.console.print(f"[yellow]Failed to parse transaction control response: {e}[/yellow]")
-            return self._generate_fallback_result()
-
-    def _generate_fallback_result(self) -> TransactionControlResult:
-        """Generate conservative fallback for transaction controls."""
-        return TransactionControlResult(
-            has_spending_limits=False,
-            has_approval_mechanisms=False,
-            emergency_stop_present=False,
-            cross_chain_controls=False,
-            transaction_monitoring=False,
-            control_strength="weak",
-            control_gaps=["Analysis failed - manual review required"]
-        )
+    section = "key_security"
+    result_cls = KeySecurityResult
+    defaults = {
+        "has_plaintext_keys": True,  # Conservative: assume yes
+        "key_generation_secure": False,  # Conservative: assume no
+        "key_storage_encrypted": False,  # Conservative: assume no
+        "key_rotation_implemented": False,  # Conservative: assume no
+        "key_exposure_risk": "high",
+        "security_concerns": ["Unable to analyze"],
+        "code_references": [],
+    }
+    fallback = KeySecurityResult(
+        has_plaintext_keys=True,  # Conservative: assume worst case
+        key_generation_secure=False,
+        key_storage_encrypted=False,
+        key_rotation_implemented=False,
+        key_exposure_risk="critical",
+        security_concerns=["Analysis failed - manual security review required"],
+        code_references=[],
+    )
 
 
-class DeceptionDetector(SecurityAnalyzer):
-    """Detector for malicious patterns and deception."""
+class TransactionControlAnalyzer(SecurityAnalyzer):
+    """Analyzer for transaction authorization controls."""
 
-    def analyze(self, context: dict[str, Any], provider: BaseLLMProvider) -> DeceptionDetectionResult:
-        """Detect malicious patterns and deception using LLM."""
+    section = "transaction_control"
+    result_cls = TransactionControlResult
+    defaults = {
+        "has_spending_limits": False,  # Conservative: assume no
+        "has_approval_mechanisms": False,  # Conservative: assume no
+        "emergency_stop_present": False,  # Conservative: assume no
+        "cross_chain_controls": False,  # Conservative: assume no
+        "transaction_monitoring": False,  # Conservative: assume no
+        "control_strength": "weak",
+        "control_gaps": ["Unable to analyze"],
+    }
+    fallback = TransactionControlResult(
+        has_spending_limits=False,
+        has_approval_mechanisms=False,
+        emergency_stop_present=False,
+        cross_chain_controls=False,
+        transaction_monitoring=False,
+        control_strength="weak",
+        control_gaps=["Analysis failed - manual review required"],
+    )
 
-        prompt = build_deception_detection_prompt(context)
 
-        try:
-            response = provider.call_llm(prompt)
-            return self._parse_response(response)
-        except Exception as e:
-            self.console.print(f"[yellow]Deception detection failed: {e}[/yellow]")
-            return self._generate_fallback_result()
+class DeceptionDetector(SecurityAnalyzer):
+    """Detector for malicious patterns and deception."""
 
-    def _parse_response(self, response: str) -> DeceptionDetectionResult:
-        """Parse LLM response for deception detection analysis."""
-        try:
-            json_match = re.search(r"```json\s*(\{.*?\})\s*```", response, re.DOTALL)
-            if json_match:
-                data = json.loads(json_match.group(1))
-            else:
-                data = json.loads(response)
-
-            # Helper function to parse boolean-like values from LLM
-            def parse_bool(value, conservative_default: bool) -> bool:
-                if isinstance(value, bool):
-                    return value
-                if isinstance(value, str):
-                    if value.lower() in ["true", "yes", "1"]:
-                        return True
-                    elif value.lower() in ["false", "no", "0"]:
-                        return False
-                    else:  # "unknown", "unclear", etc.
-                        return conservative_default
-                return conservative_default
-
-            return DeceptionDetectionResult(
-                backdoor_detected=parse_bool(data.get("backdoor_detected"), False),  # Conservative: can't detect if unknown
-                time_bomb_detected=parse_bool(data.get("time_bomb_detected"), False),  # Conservative: can't detect if unknown
-                obfuscated_code_found=parse_bool(data.get("obfuscated_code_found"), True),  # Conservative: assume yes if unknown
-                data_exfiltration_risk=parse_bool(data.get("data_exfiltration_risk"), True),  # Conservative: assume risk if unknown
-                environment_specific_behavior=parse_bool(data.get("environment_specific_behavior"), True),  # Conservative: assume risk if unknown
-                deception_indicators=data.get("deception_indicators", []),
-                risk_level=data.get("risk_level", "medium")
-            )
-        except Exception as e:
-            self.console.print(f"[yellow]Failed to parse deception response: {e}[/yellow]")
-            return self._generate_fallback_result()
-
-    def _generate_fallback_result(self) -> DeceptionDetectionResult:
-        """Generate conservative fallback for deception detection."""
-        return DeceptionDetectionResult(
-            backdoor_detected=False,  # Can't detect if analysis fails
-            time_bomb_detected=False,
-            obfuscated_code_found=True,  # Conservative: assume obfuscation
-            data_exfiltration_risk=True,  # Conservative: assume risk
-            environment_specific_behavior=True,  # Conservative: assume risk
-            deception_indicators=["Analysis failed - comprehensive manual review required"],
-            risk_level="high"  # Conservative: high risk when uncertain
-        )
+    section = "deception_detection"
+    result_cls = DeceptionDetectionResult
+    defaults = {
+        "backdoor_detected": False,  # Conservative: can't detect if unknown
+        "time_bomb_detected": False,  # Conservative: can't detect if unknown
+        "obfuscated_code_found": True,  # Conservative: assume yes if unknown
+        "data_exfiltration_risk": True,  # Conservative: assume risk if unknown
+        "environment_specific_behavior": True,  # Conservative: assume risk if unknown
+        "deception_indicators": [],
+        "risk_level": "medium",
+    }
+    fallback = DeceptionDetectionResult(
+        backdoor_detected=False,  # Can't detect if analysis fails
+        time_bomb_detected=False,
+        obfuscated_code_found=True,  # Conservative: assume obfuscation
+        data_exfiltration_risk=True,  # Conservative: assume risk
+        environment_specific_behavior=True,  # Conservative: assume risk
+        deception_indicators=["Analysis failed - comprehensive manual review required"],
+        risk_level="high",  # Conservative: high risk when uncertain
+    )
 
 
 class CapitalRiskAnalyzer(SecurityAnalyzer):
     """Analyzer for capital and financial risk assessment."""
 
-    def analyze(self, context: dict[str, Any], provider: BaseLLMProvider) -> CapitalRiskResult:
-        """Assess capital and financial risk using LLM."""
+    section = "capital_risk"
+    result_cls = CapitalRiskResult
+    defaults = {
+        "max_loss_bounded": False,  # Conservative: assume no
+        "position_size_controls": False,  # Conservative: assume no
+        "stop_loss_implemented": False,  # Conservative: assume no
+        "leverage_controls": False,  # Conservative: assume no
+        "flash_loan_usage": True,  # Conservative: assume yes if unknown
+        "risk_controls_adequate": False,  # Conservative: assume no
+        "estimated_max_loss": "unlimited",
+    }
+    fallback = CapitalRiskResult(
+        max_loss_bounded=False,
+        position_size_controls=False,
+        stop_loss_implemented=False,
+        leverage_controls=False,
+        flash_loan_usage=True,  # Conservative: assume high risk
+        risk_controls_adequate=False,
+        estimated_max_loss="unlimited",
+    )
+
+
+class CombinedSecurityAnalyzer:
+    """Runs all four security analyses in a single LLM call.
+
+    Results are cached per provider and prompt so that the per-analyzer
+    wrappers sharing one instance only pay for one round-trip.
+    """
+
+    # Parsed results keyed by provider and prompt hash, shared by
+    # all analyzers so re-verifying an unchanged agent skips the API call
+    _results: "OrderedDict[str, tuple[float, dict[str, BaseModel]]]" = OrderedDict()
+    _results_lock = threading.Lock()
+    _results_max_entries = 256
+
+    ANALYZERS: dict[str, type[SecurityAnalyzer]] = {
+        analyzer.section: analyzer
+        for analyzer in (
+            KeySecurityAnalyzer,
+            TransactionControlAnalyzer,
+            DeceptionDetector,
+            CapitalRiskAnalyzer,
+        )
+    }
 
-        prompt = build_capital_risk_prompt(context)
+    def __init__(self):
+        self.console = console
+        self.cache_ttl = float(os.getenv("LLM_CACHE_TTL_SECONDS", "3600"))
+        self._pending: dict[str, asyncio.Future] = {}
+
+    def analyze(self, context: dict[str, Any], provider: BaseLLMProvider) -> dict[str, BaseModel]:
+        """Run the combined analysis, returning one result per section."""
+        prompt = build_combined_security_prompt(context)
+        key = self._cache_key(prompt, provider)
+        results = self._get_cached_results(key)
+        if results is not None:
+            return results
 
         try:
-            response = provider.call_llm(prompt)
-            return self._parse_response(response)
+            response = provider.call_llm(prompt, SECURITY_SYSTEM_PROMPT)
         except Exception as e:
-            self.console.print(f"[yellow]Capital risk assessment failed: {e}[/yellow]")
-            return self._generate_fallback_result()
+            self.console.print(f"[yellow]Security analysis failed: {e}[/yellow]")
+            return self._fallback_results()
+        return self._handle_response(key, response)
+
+    async def analyze_async(
+        self, context: dict[str, Any], provider: BaseLLMProvider
+    ) -> dict[str, BaseModel]:
+        """Async analyze; concurrent callers for one context share the call."""
+        prompt = build_combined_security_prompt(context)
+        key = self._cache_key(prompt, provider)
+        results = self._get_cached_results(key)
+        if results is not None:
+            return results
+
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._call_async(key, prompt, provider))
+            self._pending[key] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        # Shield so one cancelled waiter does not cancel the shared call
+        return await asyncio.shield(pending)
+
+    async def _call_async(
+        self, key: str, prompt: str, provider: BaseLLMProvider
+    ) -> dict[str, BaseModel]:
+        """Issue the combined call for a prompt that is not cached."""
+        try:
+            response = await provider.call_llm_async(prompt, SECURITY_SYSTEM_PROMPT)
+        except Exception as e:
+            self.console.print(f"[yellow]Security analysis failed: {e}[/yellow]")
+            return self._fallback_results()
+        return self._handle_response(key, response)
 
-    def _parse_response(self, response: str) -> CapitalRiskResult:
-        """Parse LLM response for capital risk analysis."""
+    def _handle_response(self, key: str, response: str) -> dict[str, BaseModel]:
+        """Parse a combined response and cache the per-section results."""
         try:
-            json_match = re.search(r"```json\s*(\{.*?\})\s*```", response, re.DOTALL)
-            if json_match:
-                data = json.loads(json_match.group(1))
-            else:
-                data = json.loads(response)
-
-            # Helper function to parse boolean-like values from LLM
-            def parse_bool(value, conservative_default: bool) -> bool:
-                if isinstance(value, bool):
-                    return value
-                if isinstance(value, str):
-                    if value.lower() in ["true", "yes", "1"]:
-                        return True
-                    elif value.lower() in ["false", "no", "0"]:
-                        return False
-                    else:  # "unknown", "unclear", etc.
-                        return conservative_default
-                return conservative_default
-
-            return CapitalRiskResult(
-                max_loss_bounded=parse_bool(data.get("max_loss_bounded"), False),  # Conservative: assume no
-                position_size_controls=parse_bool(data.get("position_size_controls"), False),  # Conservative: assume no
-                stop_loss_implemented=parse_bool(data.get("stop_loss_implemented"), False),  # Conservative: assume no
-                leverage_controls=parse_bool(data.get("leverage_controls"), False),  # Conservative: assume no
-                flash_loan_usage=parse_bool(data.get("flash_loan_usage"), True),  # Conservative: assume yes if unknown
-                risk_controls_adequate=parse_bool(data.get("risk_controls_adequate"), False),  # Conservative: assume no
-                estimated_max_loss=data.get("estimated_max_loss", "unlimited")
-            )
+            data = _decode_json(response)
+            sections = {section: data.get(section, {}) for section in self.ANALYZERS}
+            complete = all(section in data for section in self.ANALYZERS)
         except Exception as e:
-            self.console.print(f"[yellow]Failed to parse capital risk response: {e}[/yellow]")
-            return self._generate_fallback_result()
-
-    def _generate_fallback_result(self) -> CapitalRiskResult:
-        """Generate conservative fallback for capital risk."""
-        return CapitalRiskResult(
-            max_loss_bounded=False,
-            position_size_controls=False,
-            stop_loss_implemented=False,
-            leverage_controls=False,
-            flash_loan_usage=True,  # Conservative: assume high risk
-            risk_controls_adequate=False,
-            estimated_max_loss="unlimited"
-        )
+            self.console.print(f"[yellow]Failed to parse security response: {e}[/yellow]")
+            return self._fallback_results()
+
+        results = {
+            section: self._parse_section(section, analyzer, sections[section])
+            for section, analyzer in self.ANALYZERS.items()
+        }
+        # Only cache complete answers: a mock, truncated or malformed
+        # response would otherwise pin defaults until the entry expires
+        if complete and not any(
+            results[section] is analyzer.fallback for section, analyzer in self.ANALYZERS.items()
+        ):
+            self._store_cached_results(key, results)
+        return results
+
+    def _get_cached_results(self, key: str) -> dict[str, BaseModel] | None:
+        """Return cached results if present and not expired."""
+        if self.cache_ttl <= 0:
+            return None
+
+        with self._results_lock:
+            entry = self._results.get(key)
+            if entry is None:
+                return None
+
+            stored_at, results = entry
+            if time.monotonic() - stored_at > self.cache_ttl:
+                del self._results[key]
+                return None
+
+            self._results.move_to_end(key)
+
+        return results
+
+    def _store_cached_results(self, key: str, results: dict[str, BaseModel]) -> None:
+        """Cache parsed results, evicting the least recently used entries."""
+        if self.cache_ttl <= 0:
+            return
+
+        with self._results_lock:
+            self._results[key] = (time.monotonic(), results)
+            self._results.move_to_end(key)
+            while len(self._results) > self._results_max_entries:
+                self._results.popitem(last=False)
+
+    def _fallback_results(self) -> dict[str, BaseModel]:
+        """Conservative fallback for every section."""
+        return {
+            section: analyzer._generate_fallback_result()
+            for section, analyzer in self.ANALYZERS.items()
+        }
+
+    def _parse_section(
+        self, section: str, analyzer: type[SecurityAnalyzer], data: Any
+    ) -> BaseModel:
+        """Build one section's result, falling back if it is malformed."""
+        try:
+            return analyzer._result_from_data(data)
+        except Exception as e:
+            self.console.print(f"[yellow]Failed to parse {section} response: {e}[/yellow]")
+            return analyzer._generate_fallback_result()
+
+    @staticmethod
+    def _cache_key(prompt: str, provider: BaseLLMProvider) -> str:
+        """Key results by provider and a hash of the system and user prompts.
+
+        The prompt only carries the context fields the analyses read, so
+        contexts differing in anything else, such as the evaluation
+        timestamp, share an entry.
+        """
+        digest = hashlib.sha256(
+            f"{SECURITY_SYSTEM_PROMPT}\n{prompt}".encode("utf-8")
+        ).hexdigest()
+        return f"{provider.provider_type.value}:{digest}"
@@ -1,29 +1,19 @@
 """Security-focused prompt templates for trust analysis."""
 
+import string
 from typing import Any
 
+from ..utils import format_agent_patterns
 
-def build_key_security_prompt(context: dict[str, Any]) -> str:
-    """Build prompt for private key security analysis."""
 
-    def format_agent_patterns(patterns: dict[str, list[str]]) -> str:
-        """Format agent patterns for prompt inclusion."""
-        formatted = []
-        for category, items in patterns.items():
-            if items:
-                formatted.append(f"**{category.title()}:**")
-                for item in items[:3]:  # Limit to 3 items per category
-                    formatted.append(f"  - {item}")
-        return "\n".join(formatted) if formatted else "No specific patterns detected"
-
-    return f"""
+KEY_SECURITY_TEMPLATE = string.Template("""
 # Private Key Security Analysis
 
 You are a security auditor evaluating if this autonomous agent can be trusted with private key management.
 
 ## Context
-- **Image**: {context.get('image_info', {}).get('tag', 'unknown')}
-- **Agent Patterns**: {format_agent_patterns(context.get('agent_patterns', {}))}
+- **Image**: $image_tag
+- **Agent Patterns**: $agent_patterns
 
 ## Critical Security Analysis
 
@@ -61,7 +51,7 @@ Analyze for private key security vulnerabilities based on Coinbase CDP and Strip
 
 Return your analysis in JSON format:
 ```json
-{{
+{
   "has_plaintext_keys": false,
   "key_generation_secure": true,
   "key_storage_encrypted": true,
@@ -69,34 +59,21 @@ Return your analysis in JSON format:
   "key_exposure_risk": "low|medium|high|critical",
   "security_concerns": ["concern1", "concern2"],
   "code_references": ["file:line", "pattern"]
-}}
+}
 ```
 
-Be paranoid. Users will trust this agent with $40k+ annually.
-"""
-
-
-def build_transaction_control_prompt(context: dict[str, Any]) -> str:
-    """Build prompt for transaction control analysis."""
+Be paranoid. Users will trust this agent with $$40k+ annually.
+""")
 
-    def format_agent_patterns(patterns: dict[str, list[str]]) -> str:
-        """Format agent patterns for prompt inclusion."""
-        formatted = []
-        for category, items in patterns.items():
-            if items:
-                formatted.append(f"**{category.title()}:**")
-                for item in items[:3]:  # Limit to 3 items per category
-                    formatted.append(f"  - {item}")
-        return "\n".join(formatted) if formatted else "No specific patterns detected"
 
-    return f"""
+TRANSACTION_CONTROL_TEMPLATE = string.Template("""
 # Transaction Authorization Control Analysis
 
 You are a security auditor evaluating transaction controls for an autonomous trading agent.
 
 ## Context
-- **Image**: {context.get('image_info', {}).get('tag', 'unknown')}
-- **Agent Patterns**: {format_agent_patterns(context.get('agent_patterns', {}))}
+- **Image**: $image_tag
+- **Agent Patterns**: $agent_patterns
 
 ## Transaction Security Analysis
 
@@ -136,7 +113,7 @@ Look for functions like: sign_tx(), approve(), transfer(), send(), swap()
 
 Return your analysis in JSON format:
 ```json
-{{
+{
   "has_spending_limits": true,
   "has_approval_mechanisms": true,
   "emergency_stop_present": true,
@@ -144,34 +121,21 @@ Return your analysis in JSON format:
   "transaction_monitoring": true,
   "control_strength": "weak|moderate|strong",
   "control_gaps": ["gap1", "gap2"]
-}}
+}
 ```
 
 Focus on: Can this agent drain funds or execute unauthorized transactions?
-"""
-
-
-def build_deception_detection_prompt(context: dict[str, Any]) -> str:
-    """Build prompt for deception and malicious pattern detection."""
+""")
 
-    def format_agent_patterns(patterns: dict[str, list[str]]) -> str:
-        """Format agent patterns for prompt inclusion."""
-        formatted = []
-        for category, items in patterns.items():
-            if items:
-                formatted.append(f"**{category.title()}:**")
-                for item in items[:3]:  # Limit to 3 items per category
-                    formatted.append(f"  - {item}")
-        return "\n".join(formatted) if formatted else "No specific patterns detected"
 
-    return f"""
+DECEPTION_DETECTION_TEMPLATE = string.Template("""
 # Malicious Pattern & Deception Detection
 
 You are a security auditor looking for deceptive or malicious patterns in an autonomous agent.
 
 ## Context
-- **Image**: {context.get('image_info', {}).get('tag', 'unknown')}
-- **Agent Patterns**: {format_agent_patterns(context.get('agent_patterns', {}))}
+- **Image**: $image_tag
+- **Agent Patterns**: $agent_patterns
 
 ## Deception Analysis
 
@@ -213,7 +177,7 @@ You are a security auditor looking for deceptive or malicious patterns in an aut
 
 Return your analysis in JSON format:
 ```json
-{{
+{
   "backdoor_detected": false,
   "time_bomb_detected": false,
   "obfuscated_code_found": false,
@@ -221,34 +185,21 @@ Return your analysis in JSON format:
   "environment_specific_behavior": false,
   "deception_indicators": ["indicator1", "indicator2"],
   "risk_level": "low|medium|high|critical"
-}}
+}
 ```
 
 Be extremely suspicious. Look for anything that suggests the agent might not do what it claims.
-"""
-
-
-def build_capital_risk_prompt(context: dict[str, Any]) -> str:
-    """Build prompt for capital risk assessment."""
+""")
 
-    def format_agent_patterns(patterns: dict[str, list[str]]) -> str:
-        """Format agent patterns for prompt inclusion."""
-        formatted = []
-        for category, items in patterns.items():
-            if items:
-                formatted.append(f"**{category.title()}:**")
-                for item in items[:3]:  # Limit to 3 items per category
-                    formatted.append(f"  - {item}")
-        return "\n".join(formatted) if formatted else "No specific patterns detected"
 
-    return f"""
+CAPITAL_RISK_TEMPLATE = string.Template("""
 # Capital & Financial Risk Assessment
 
 You are a risk management auditor evaluating capital protection for an autonomous trading agent.
 
 ## Context
-- **Image**: {context.get('image_info', {}).get('tag', 'unknown')}
-- **Agent Patterns**: {format_agent_patterns(context.get('agent_patterns', {}))}
+- **Image**: $image_tag
+- **Agent Patterns**: $agent_patterns
 
 ## Capital Risk Analysis
 
@@ -287,7 +238,7 @@ Look for functions like: calculate_position_size(), set_stop_loss(), check_risk_
 
 Return your analysis in JSON format:
 ```json
-{{
+{
   "max_loss_bounded": true,
   "position_size_controls": true,
   "stop_loss_implemented": true,
@@ -295,8 +246,74 @@ Return your analysis in JSON format:
   "flash_loan_usage": false,
   "risk_controls_adequate": true,
   "estimated_max_loss": "bounded|portfolio_percentage|unlimited"
-}}
+}
 ```
 
 Critical question: Could this agent lose more money than acceptable in worst-case scenarios?
+""")
+
+
+def _prompt_fields(context: dict[str, Any]) -> dict[str, str]:
+    """Render the context fields substituted into the section templates."""
+    return {
+        "image_tag": context.get("image_info", {}).get("tag", "unknown"),
+        "agent_patterns": format_agent_patterns(context.get("agent_patterns", {})),
+    }
+
+
+# Section templates of the combined prompt, keyed by result section
+SECURITY_PROMPT_TEMPLATES = {
+    "key_security": KEY_SECURITY_TEMPLATE,
+    "transaction_control": TRANSACTION_CONTROL_TEMPLATE,
+    "deception_detection": DECEPTION_DETECTION_TEMPLATE,
+    "capital_risk": CAPITAL_RISK_TEMPLATE,
+}
+
+
+# Per-agent context of the section templates; the combined analysis sends
+# only this block per call and keeps the rest in the system prompt
+CONTEXT_BLOCK = """## Context
+- **Image**: $image_tag
+- **Agent Patterns**: $agent_patterns
 """
+CONTEXT_TEMPLATE = string.Template(CONTEXT_BLOCK)
+
+
+def _build_security_system_prompt() -> str:
+    """Join the static part of every section template into one system prompt."""
+    sections = "\n".join(
+        f"## {name}\n"
+        + string.Template(template.template.replace(CONTEXT_BLOCK + "\n", "")).substitute()
+        for name, template in SECURITY_PROMPT_TEMPLATES.items()
+    )
+    keys = ", ".join(f'"{name}": {{...}}' for name in SECURITY_PROMPT_TEMPLATES)
+
+    return f"""
+# Combined Trust Security Analysis
+
+Perform each of the security analyses below for the same agent. The agent's
+context is provided in the user message. Each section describes the JSON
+object it expects.
+
+{sections}
+
+Return all four analyses as ONE JSON object keyed by section name, where each
+value is the JSON object that section asks for:
+```json
+{{{keys}}}
+```
+""".strip()
+
+
+# Static instructions of the combined security analysis. Sent as the system
+# prompt so providers can cache it across agents.
+SECURITY_SYSTEM_PROMPT = _build_security_system_prompt()
+
+
+def build_combined_security_prompt(context: dict[str, Any]) -> str:
+    """Build the per-agent part of the combined security analysis prompt.
+
+    The task itself is the constant SECURITY_SYSTEM_PROMPT; the user message
+    only carries the image tag and agent patterns.
+    """
+    return CONTEXT_TEMPLATE.substitute(_prompt_fields(context))
@@ -8,6 +8,31 @@ from ..models import (
     TransactionControlResult,
     TrustFocusedResult,
 )
+from .analyzers import (
+    CapitalRiskAnalyzer,
+    DeceptionDetector,
+    KeySecurityAnalyzer,
+    TransactionControlAnalyzer,
+)
+
+# Conservative assessment returned whenever trust analysis fails
+FALLBACK_TRUST_ASSESSMENT = TrustFocusedResult(
+    can_trust_with_capital=False,  # Never trust when analysis fails
+    trust_score=0.0,
+    key_security=KeySecurityAnalyzer.fallback,
+    transaction_controls=TransactionControlAnalyzer.fallback,
+    deception_analysis=DeceptionDetector.fallback,
+    capital_risk=CapitalRiskAnalyzer.fallback,
+    critical_vulnerabilities=["Security analysis failed - comprehensive manual review required"],
+    security_recommendations=[
+        "CRITICAL: Perform manual security audit before deployment",
+        "CRITICAL: Verify private key security manually",
+        "CRITICAL: Test transaction controls manually",
+        "HIGH: Review code for deceptive patterns"
+    ],
+    confidence_level=0.0,
+    reasoning="Trust-focused security analysis failed. Conservative assessment applied. Manual security review strongly recommended before any deployment."
+)
 
 
 class TrustScoreCalculator:
@@ -33,55 +58,41 @@ class TrustScoreCalculator:
         if deception_analysis.risk_level == "critical":
             critical_vulnerabilities.append("Critical deception patterns detected")
 
-        # Calculate weighted trust score
-        trust_score = 0.0
-
-        # Key security (30% weight)
-        key_score = 0.0
-        if not key_security.has_plaintext_keys:
-            key_score += 0.4
-        if key_security.key_generation_secure:
-            key_score += 0.3
-        if key_security.key_storage_encrypted:
-            key_score += 0.2
-        if key_security.key_rotation_implemented:
-            key_score += 0.1
-        trust_score += key_score * 0.3
-
-        # Transaction controls (25% weight)
-        tx_score = 0.0
-        if transaction_controls.has_spending_limits:
-            tx_score += 0.4
-        if transaction_controls.has_approval_mechanisms:
-            tx_score += 0.3
-        if transaction_controls.emergency_stop_present:
-            tx_score += 0.2
-        if transaction_controls.transaction_monitoring:
-            tx_score += 0.1
-        trust_score += tx_score * 0.25
-
-        # Deception analysis (20% weight)
-        deception_score = 1.0  # Start with full score
-        if deception_analysis.backdoor_detected:
-            deception_score -= 0.5
-        if deception_analysis.time_bomb_detected:
-            deception_score -= 0.3
-        if deception_analysis.obfuscated_code_found:
-            deception_score -= 0.2
-        deception_score = max(0.0, deception_score)
-        trust_score += deception_score * 0.2
-
-        # Capital risk (25% weight)
-        capital_score = 0.0
-        if capital_risk.max_loss_bounded:
-            capital_score += 0.3
-        if capital_risk.position_size_controls:
-            capital_score += 0.3
-        if capital_risk.stop_loss_implemented:
-            capital_score += 0.2
-        if capital_risk.risk_controls_adequate:
-            capital_score += 0.2
-        trust_score += capital_score * 0.25
+        # Weighted sub-scores: each flag contributes its weight when it holds
+        key_score = (
+            0.4 * (not key_security.has_plaintext_keys)
+            + 0.3 * key_security.key_generation_secure
+            + 0.2 * key_security.key_storage_encrypted
+            + 0.1 * key_security.key_rotation_implemented
+        )
+        tx_score = (
+            0.4 * transaction_controls.has_spending_limits
+            + 0.3 * transaction_controls.has_approval_mechanisms
+            + 0.2 * transaction_controls.emergency_stop_present
+            + 0.1 * transaction_controls.transaction_monitoring
+        )
+        # Deception starts from full score and loses weight per finding
+        deception_score = max(
+            0.0,
+            1.0
+            - 0.5 * deception_analysis.backdoor_detected
+            - 0.3 * deception_analysis.time_bomb_detected
+            - 0.2 * deception_analysis.obfuscated_code_found,
+        )
+        capital_score = (
+            0.3 * capital_risk.max_loss_bounded
+            + 0.3 * capital_risk.position_size_controls
+            + 0.2 * capital_risk.stop_loss_implemented
+            + 0.2 * capital_risk.risk_controls_adequate
+        )
+
+        # Key security 30%, transaction controls 25%, deception 20%, capital 25%
+        trust_score = (
+            key_score * 0.3
+            + tx_score * 0.25
+            + deception_score * 0.2
+            + capital_score * 0.25
+        )
 
         # Determine if agent can be trusted with capital
         can_trust = (
@@ -186,61 +197,8 @@ class TrustScoreCalculator:
         return "\n\n".join(reasoning_parts)
 
     def generate_fallback_trust_assessment(self, context: dict) -> TrustFocusedResult:
-        """Generate conservative fallback trust assessment."""
-        key_security = KeySecurityResult(
-            has_plaintext_keys=True,
-            key_generation_secure=False,
-            key_storage_encrypted=False,
-            key_rotation_implemented=False,
-            key_exposure_risk="critical",
-            security_concerns=["Analysis failed - manual security review required"],
-            code_references=[]
-        )
+        """Return the conservative fallback trust assessment.
 
-        transaction_controls = TransactionControlResult(
-            has_spending_limits=False,
-            has_approval_mechanisms=False,
-            emergency_stop_present=False,
-            cross_chain_controls=False,
-            transaction_monitoring=False,
-            control_strength="weak",
-            control_gaps=["Analysis failed - manual review required"]
-        )
-
-        deception_analysis = DeceptionDetectionResult(
-            backdoor_detected=False,
-            time_bomb_detected=False,
-            obfuscated_code_found=True,
-            data_exfiltration_risk=True,
-            environment_specific_behavior=True,
-            deception_indicators=["Analysis failed - comprehensive manual review required"],
-            risk_level="high"
-        )
-
-        capital_risk = CapitalRiskResult(
-            max_loss_bounded=False,
-            position_size_controls=False,
-            stop_loss_implemented=False,
-            leverage_controls=False,
-            flash_loan_usage=True,
-            risk_controls_adequate=False,
-            estimated_max_loss="unlimited"
-        )
-
-        return TrustFocusedResult(
-            can_trust_with_capital=False,  # Never trust when analysis fails
-            trust_score=0.0,
-            key_security=key_security,
-            transaction_controls=transaction_controls,
-            deception_analysis=deception_analysis,
-            capital_risk=capital_risk,
-            critical_vulnerabilities=["Security analysis failed - comprehensive manual review required"],
-            security_recommendations=[
-                "CRITICAL: Perform manual security audit before deployment",
-                "CRITICAL: Verify private key security manually",
-                "CRITICAL: Test transaction controls manually",
-                "HIGH: Review code for deceptive patterns"
-            ],
-            confidence_level=0.0,
-            reasoning="Trust-focused security analysis failed. Conservative assessment applied. Manual security review strongly recommended before any deployment."
-        )
+        The result is frozen and shared by every failed evaluation.
+        """
+        return FALLBACK_TRUST_ASSESSMENT
@@ -1,73 +1,210 @@
 """Helper utilities for LLM judge functionality."""
 
+import json
+import re
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
+from rich.console import Console
+
+try:
+    import orjson
+except ImportError:  # Optional speedup, see the "fast" extra
+    orjson = None
+
+# Shared by every judge component; they only print progress and warnings
+console = Console()
+
+# Fenced ```json block in an LLM response
+JSON_FENCE_RE = re.compile(r"```json\s*(\{.*?\})\s*```", re.DOTALL)
+
+# Characters that affect brace matching in a JSON document
+JSON_STRUCTURE_RE = re.compile(r'[{}"\\]')
+
+# Severities counted in vulnerability summaries, most severe first
+SEVERITY_LEVELS = ("CRITICAL", "HIGH", "MEDIUM", "LOW")
+
+# Agent-related keywords in Docker layer commands, grouped by category.
+# The lookahead makes overlapping keywords from different categories match.
+AGENT_PATTERN_RE = re.compile(
+    r"(?=(?P<dependencies>npm install|pip install|yarn add)"
+    r"|(?P<configurations>config|env|secret)"
+    r"|(?P<commands>run|start|exec))"
+)
+
+
+def json_loads(data: str | bytes) -> Any:
+    """Parse JSON with orjson when installed, otherwise the standard library.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+    catch the latter either way.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(data: Any) -> bytes:
+    """Serialize JSON to UTF-8 bytes with orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def extract_json_block(text: str) -> str:
+    """Return the JSON object in a response's ```json fence.
+
+    Scans for the balanced closing brace, skipping string literals, so the
+    cost stays linear however the fence is malformed. Only structural
+    characters are visited, so ordinary text is skipped at regex speed.
+    Text without a fence is returned unchanged; an unbalanced object is
+    returned as-is and left for the JSON parser to reject.
+    """
+    fence = text.find("```json")
+    if fence < 0:
+        return text
+    start = text.find("{", fence)
+    if start < 0:
+        return text
+
+    depth = 0
+    in_string = False
+    skip_until = start
+    for match in JSON_STRUCTURE_RE.finditer(text, start):
+        index = match.start()
+        if index < skip_until:
+            continue  # Escaped character inside a string
+        char = text[index]
+        if in_string:
+            if char == "\\":
+                skip_until = index + 2
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:index + 1]
+    return text[start:]
+
+
+def _severity(vuln: dict) -> str:
+    """Normalized severity of a vulnerability record."""
+    # Scanner feeds differ in severity casing and padding
+    return str(vuln.get("severity", "UNKNOWN")).strip().upper()
+
+
+def _count_severities(severities: Iterable[str]) -> dict[str, int]:
+    """Count normalized severities, keeping only the summarized levels."""
+    counts = Counter(severities)
+    return {severity: counts[severity] for severity in SEVERITY_LEVELS}
+
 
 def summarize_vulnerabilities(vulnerabilities: list[dict]) -> dict[str, int]:
     """Summarize vulnerability counts by severity."""
-    counts = {"CRITICAL": 0, "HIGH": 0, "MEDIUM": 0, "LOW": 0}
-    for vuln in vulnerabilities:
-        severity = vuln.get("severity", "UNKNOWN")
-        if severity in counts:
-            counts[severity] += 1
-    return counts
+    return _count_severities(_severity(vuln) for vuln in vulnerabilities)
 
 
-def extract_agent_patterns(layers: list[dict]) -> dict[str, list[str]]:
-    """Extract agent-related patterns from Docker layers."""
+def _match_agent_patterns(commands: Iterable[str]) -> dict[str, list[str]]:
+    """Group lowercased layer commands by the agent keywords they contain."""
     patterns = {"dependencies": [], "configurations": [], "commands": []}
 
-    for layer in layers:
-        command = layer.get("command", "").lower()
+    for command in commands:
+        # Collect every category with a keyword anywhere in the command
+        matched = set()
+        for match in AGENT_PATTERN_RE.finditer(command):
+            matched.add(match.lastgroup)
+            if len(matched) == len(patterns):
+                break
 
-        # Look for agent-related dependencies
-        if any(
-            dep in command for dep in ["npm install", "pip install", "yarn add"]
-        ):
-            patterns["dependencies"].append(command[:100])
+        for category in matched:
+            patterns[category].append(command[:100])
 
-        # Look for configuration patterns
-        if any(cfg in command for cfg in ["config", "env", "secret"]):
-            patterns["configurations"].append(command[:100])
+    return patterns
 
-        # Look for execution commands
-        if any(cmd in command for cmd in ["run", "start", "exec"]):
-            patterns["commands"].append(command[:100])
 
-    return patterns
+def extract_agent_patterns(layers: list[dict]) -> dict[str, list[str]]:
+    """Extract agent-related patterns from Docker layers."""
+    return _match_agent_patterns(layer.get("command", "").lower() for layer in layers)
+
+
+# Prompt headings of the categories produced by extract_agent_patterns
+CATEGORY_HEADERS = {
+    category: f"**{category.title()}:**"
+    for category in ("dependencies", "configurations", "commands")
+}
 
 
 def format_agent_patterns(patterns: dict[str, list[str]]) -> str:
     """Format agent patterns for prompt inclusion."""
     formatted = []
     for category, items in patterns.items():
-        if items:
-            formatted.append(f"**{category.title()}:**")
-            for item in items[:3]:  # Limit to 3 items per category
-                formatted.append(f"  - {item}")
+        if not items:
+            continue
+        formatted.append(CATEGORY_HEADERS.get(category) or f"**{category.title()}:**")
+        formatted += ["  - " + item for item in items[:3]]  # Limit to 3 items per category
     return "\n".join(formatted) if formatted else "No specific patterns detected"
 
 
+@dataclass(frozen=True, slots=True)
+class ImageData:
+    """Docker scan fields read by LLM evaluation, extracted in one pass.
+
+    Layer commands are kept lowercased and vulnerability severities
+    normalized, so building the context does no per-record dict lookups.
+    """
+
+    tag: str
+    size: int
+    layer_commands: tuple[str, ...]
+    shade_agent_detected: bool
+    severities: tuple[str, ...]
+
+    @classmethod
+    def from_dict(cls, image_data: dict[str, Any]) -> "ImageData":
+        """Extract the evaluation fields of a Docker scan result."""
+        return cls(
+            tag=image_data.get("image_tag", "unknown"),
+            size=image_data.get("size", 0),
+            layer_commands=tuple(
+                layer.get("command", "").lower() for layer in image_data.get("layers", [])
+            ),
+            shade_agent_detected=image_data.get("shade_agent_detected", False),
+            severities=tuple(
+                _severity(vuln) for vuln in image_data.get("vulnerabilities", [])
+            ),
+        )
+
+
 def prepare_evaluation_context(
     image_data: dict[str, Any],
     code_analysis: dict[str, Any] | None,
     market_context: dict[str, Any] | None,
+    now: datetime | None = None,
 ) -> dict[str, Any]:
-    """Prepare comprehensive context for LLM evaluation."""
+    """Prepare comprehensive context for LLM evaluation.
+
+    ``now`` is the evaluation time; it defaults to the current time.
+    """
+
+    image = ImageData.from_dict(image_data)
 
     context = {
         "image_info": {
-            "tag": image_data.get("image_tag", "unknown"),
-            "size": image_data.get("size", 0),
-            "layers": len(image_data.get("layers", [])),
-            "shade_agent_detected": image_data.get("shade_agent_detected", False),
-            "vulnerabilities": summarize_vulnerabilities(
-                image_data.get("vulnerabilities", [])
-            ),
+            "tag": image.tag,
+            "size": image.size,
+            "layers": len(image.layer_commands),
+            "shade_agent_detected": image.shade_agent_detected,
+            "vulnerabilities": _count_severities(image.severities),
         },
         "deployment_context": {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": (now or datetime.now()).isoformat(),
             "evaluation_version": "2.0",
             "market_conditions": market_context or {"status": "unknown"},
         },
@@ -78,18 +215,19 @@ def prepare_evaluation_context(
         context["code_analysis"] = code_analysis
 
     # Extract agent patterns from image layers
-    context["agent_patterns"] = extract_agent_patterns(
-        image_data.get("layers", [])
-    )
+    context["agent_patterns"] = _match_agent_patterns(image.layer_commands)
 
     return context
 
 
+# In production, these would be loaded from files or configuration
+EVALUATION_TEMPLATES: dict[str, str] = {
+    "agent_classification": "Classify agent strategy and risk profile",
+    "code_quality": "Assess code architecture and maintainability",
+    "risk_assessment": "Evaluate market and operational risks",
+}
+
+
 def load_evaluation_templates() -> dict[str, str]:
     """Load evaluation templates and prompts."""
-    # In production, these would be loaded from files or configuration
-    return {
-        "agent_classification": "Classify agent strategy and risk profile",
-        "code_quality": "Assess code architecture and maintainability",
-        "risk_assessment": "Evaluate market and operational risks",
-    }
+    return EVALUATION_TEMPLATES
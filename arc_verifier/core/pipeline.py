@@ -56,7 +56,7 @@ class VerificationPipeline:
             Tuple of (llm_result, detected_strategy)
         """
         try:
-            llm_judge = LLMJudge(primary_provider=llm_provider)
+            llm_judge = LLMJudge.shared(llm_provider)
             llm_result = llm_judge.evaluate_agent(
                 image_data=scan_result,
                 market_context={"tier": tier, "timestamp": scan_result.get('timestamp')}
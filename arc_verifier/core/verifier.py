@@ -142,7 +142,7 @@ class CoreArcVerifier:
     def llm_judge(self) -> LLMJudge:
         """Lazy initialization of LLM judge to avoid startup overhead."""
         if self._llm_judge is None:
-            self._llm_judge = LLMJudge()
+            self._llm_judge = LLMJudge.shared()
         return self._llm_judge
     
     async def verify_agent(self, 
@@ -419,9 +419,8 @@ class CoreArcVerifier:
     async def _run_llm_analysis(self, agent_image: str) -> Dict[str, Any]:
         """Run LLM analysis with resource control."""
         async with self._llm_semaphore:
-            # LLM calls are I/O bound, don't use thread pool
-            result = await asyncio.to_thread(
-                self.llm_judge.evaluate_agent,
+            # LLM calls are I/O bound, await them on the event loop
+            result = await self.llm_judge.evaluate_agent_async(
                 {"image_tag": agent_image},
                 {"timestamp": datetime.now()}
             )
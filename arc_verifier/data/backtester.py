@@ -15,7 +15,6 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from .fetcher import MarketDataManager
 from .registry import DataRegistry
-from .container_backtester import ContainerBacktester
 import docker
 
 
@@ -79,6 +78,8 @@ class RealBacktester:
 
     def __init__(self):
         self.console = Console()
+        # Imported lazily: container_backtester imports the result types defined here
+        from .container_backtester import ContainerBacktester
         self.container_backtester = ContainerBacktester()
         self.docker_client = None
         
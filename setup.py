@@ -60,6 +60,9 @@ setup(
             "anthropic>=0.18.0",
             "openai>=1.0.0",
         ],
+        "fast": [
+            "orjson>=3.9.0",
+        ],
         "web": [
             "flask>=2.3.0",
             "flask-cors>=4.0.0",
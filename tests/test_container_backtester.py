@@ -0,0 +1,378 @@
+"""Tests for the container backtester module."""
+
+import os
+import threading
+
+import docker
+import pytest
+import pandas as pd
+import requests
+from unittest.mock import Mock, patch, MagicMock
+
+from arc_verifier.data.container_backtester import ContainerBacktester
+
+
+TRADE_LOGS = b"""starting agent
+{"action": "arbitrage_buy", "timestamp": "2024-05-01T00:00:00", "symbol": "BTC", "side": "buy", "price": 60000.0, "amount": 0.1, "pnl": 50.0}
+{"action": "heartbeat", "timestamp": "2024-05-01T01:00:00"}
+{"action": "arbitrage_sell", "timestamp": "2024-05-01T02:00:00", "symbol": "BTC", "side": "sell", "price": 60500.0, "amount": 0.1, "pnl": -20.0}
+{"action": "momentum_exit", "timestamp": "2024-05-01T04:00:00", "symbol": "ETH", "side": "sell", "price": 3000.0, "amount": 1.0}
+"""
+
+
+@pytest.fixture
+def market_data():
+    """Create one day of 1-minute candles."""
+    index = pd.date_range(start="2024-05-01", periods=24 * 60, freq="min")
+    return pd.DataFrame({"close": 60000.0}, index=index)
+
+
+@pytest.fixture
+def backtester(market_data):
+    """Create a ContainerBacktester with mocked Docker and market data."""
+    data_manager = Mock()
+    data_manager.fetch_market_data.side_effect = lambda symbols, **kwargs: {
+        symbol: market_data for symbol in symbols
+    }
+    with patch('docker.from_env'):
+        return ContainerBacktester(data_manager=data_manager)
+
+
+class TestLogParsing:
+    """Test trade extraction from agent logs."""
+
+    def test_parse_agent_logs(self, backtester):
+        """Test that only trade actions become trades."""
+        trades = backtester._parse_agent_logs(TRADE_LOGS)
+
+        assert len(trades) == 3
+        assert list(trades["pair"]) == ["BTC/USDT", "BTC/USDT", "ETH/USDT"]
+        assert trades["timestamp"].iloc[1] == pd.Timestamp("2024-05-01T02:00:00")
+        assert trades["price"].dtype == "float64"
+        assert pd.isna(trades["pnl"].iloc[2])
+
+    def test_log_stream_split_across_chunks(self, backtester):
+        """Test that lines split across stream chunks are reassembled."""
+        chunks = [TRADE_LOGS[:70], TRADE_LOGS[70:200], TRADE_LOGS[200:]]
+
+        lines = list(backtester._iter_log_lines(iter(chunks)))
+
+        assert lines == TRADE_LOGS.split(b"\n")[:-1]
+
+    def test_unterminated_last_line(self, backtester):
+        """Test that output without a trailing newline is still yielded."""
+        lines = list(backtester._iter_log_lines(iter([b"first\nsec", b"ond"])))
+
+        assert lines == [b"first", b"second"]
+
+    def test_invalid_timestamp_skipped(self, backtester):
+        """Test that trades with unparseable timestamps are dropped."""
+        logs = TRADE_LOGS.replace(b"2024-05-01T02:00:00", b"yesterday")
+
+        trades = backtester._parse_agent_logs(logs)
+
+        assert len(trades) == 2
+
+    def test_mixed_offsets_normalized_to_utc(self, backtester):
+        """Test that naive and offset timestamps end up in one UTC column."""
+        logs = TRADE_LOGS.replace(b"2024-05-01T02:00:00", b"2024-05-01T04:00:00+02:00")
+
+        trades = backtester._parse_agent_logs(logs)
+        metrics = backtester._calculate_metrics(trades, 100000, 100030, 24)
+
+        assert str(trades["timestamp"].dt.tz) == "UTC"
+        assert trades["timestamp"].iloc[1] == pd.Timestamp("2024-05-01T02:00:00Z")
+        assert metrics.avg_trade_duration == pytest.approx(2.0)
+
+    def test_trades_to_dicts(self, backtester):
+        """Test JSON-ready trade serialization."""
+        trades = backtester._trades_to_dicts(backtester._parse_agent_logs(TRADE_LOGS))
+
+        assert trades[0] == {
+            "timestamp": "2024-05-01T00:00:00",
+            "pair": "BTC/USDT",
+            "side": "buy",
+            "price": 60000.0,
+            "amount": 0.1,
+            "pnl": 50.0,
+            "signal": "arbitrage_buy",
+        }
+        assert trades[2]["pnl"] is None
+
+
+class TestMarketDataCache:
+    """Test reuse of fetched market data frames."""
+
+    def test_market_data_fetched_once(self, backtester, market_data):
+        """Test that a cached frame is not fetched again."""
+        first = backtester._fetch_cached(["BTCUSDT", "ETHUSDT"], "2024-05-01", "2024-05-02", "1m")
+        second = backtester._fetch_cached(["BTCUSDT"], "2024-05-01", "2024-05-02", "1m")
+
+        backtester.data_manager.fetch_market_data.assert_called_once()
+        assert set(first) == {"BTCUSDT", "ETHUSDT"}
+        assert second["BTCUSDT"] is market_data
+
+    def test_least_recently_used_frame_evicted(self, backtester):
+        """Test that the cache stays bounded."""
+        backtester._market_data_cache_size = 2
+
+        for day in ("01", "02", "03"):
+            backtester._fetch_cached(["BTCUSDT"], f"2024-05-{day}", "2024-05-04", "1m")
+
+        assert list(backtester.market_data_cache) == [
+            ("BTCUSDT", "2024-05-02", "2024-05-04", "1m"),
+            ("BTCUSDT", "2024-05-03", "2024-05-04", "1m"),
+        ]
+
+    def test_failed_fetch_not_cached(self, backtester, market_data):
+        """Test that a failed fetch is retried by the next caller."""
+        backtester.data_manager.fetch_market_data.side_effect = [
+            ConnectionError("offline"),
+            {"BTCUSDT": market_data},
+        ]
+
+        with pytest.raises(ConnectionError):
+            backtester._fetch_cached(["BTCUSDT"], "2024-05-01", "2024-05-02", "1m")
+        result = backtester._fetch_cached(["BTCUSDT"], "2024-05-01", "2024-05-02", "1m")
+
+        assert result["BTCUSDT"] is market_data
+        assert backtester.data_manager.fetch_market_data.call_count == 2
+
+    def test_concurrent_callers_share_fetch(self, backtester, market_data):
+        """Test that callers missing the same frame wait for one fetch."""
+        entered, release = threading.Event(), threading.Event()
+
+        def slow_fetch(symbols, **kwargs):
+            entered.set()
+            release.wait(5)
+            return {symbol: market_data for symbol in symbols}
+
+        backtester.data_manager.fetch_market_data.side_effect = slow_fetch
+        results = []
+
+        def fetch():
+            results.append(
+                backtester._fetch_cached(["BTCUSDT"], "2024-05-01", "2024-05-02", "1m")
+            )
+
+        first = threading.Thread(target=fetch)
+        first.start()
+        entered.wait(5)
+        second = threading.Thread(target=fetch)
+        second.start()
+        # An unrelated frame is not blocked by the fetch in flight
+        backtester.data_manager.fetch_market_data.side_effect = lambda symbols, **kwargs: {
+            symbol: market_data for symbol in symbols
+        }
+        assert "ETHUSDT" in backtester._fetch_cached(["ETHUSDT"], "2024-05-01", "2024-05-02", "1m")
+        release.set()
+        first.join(5)
+        second.join(5)
+
+        assert backtester.data_manager.fetch_market_data.call_count == 2
+        assert len(results) == 2
+        assert all(result["BTCUSDT"] is market_data for result in results)
+
+
+class TestMetrics:
+    """Test performance metric calculation."""
+
+    def test_calculate_metrics(self, backtester):
+        """Test metrics computed from a trades frame."""
+        trades = backtester._parse_agent_logs(TRADE_LOGS)
+
+        metrics = backtester._calculate_metrics(trades, 100000, 100030, 24)
+
+        assert metrics.total_trades == 3
+        # Unreported PnL counts as neither a win nor a loss
+        assert metrics.win_rate == pytest.approx(1 / 3)
+        assert metrics.profit_factor == pytest.approx(2.5)
+
+    def test_average_trade_spacing(self, backtester):
+        """Test the mean gap between consecutive trades, in hours."""
+        trades = backtester._parse_agent_logs(TRADE_LOGS)
+
+        metrics = backtester._calculate_metrics(trades, 100000, 100030, 24)
+
+        assert metrics.avg_trade_duration == pytest.approx(2.0)
+
+    def test_calculate_metrics_no_trades(self, backtester):
+        """Test metrics for an agent that never traded."""
+        trades = backtester._parse_agent_logs(b"no trades today\n")
+
+        metrics = backtester._calculate_metrics(trades, 100000, 100000, 24)
+
+        assert metrics.total_trades == 0
+        assert metrics.win_rate == 0
+        assert metrics.profit_factor == 999.0
+
+    def test_count_market_hours(self, backtester):
+        """Test hours are derived from cached minute data."""
+        assert backtester._count_market_hours("2024-05-01", "2024-05-02") == 24
+        backtester.data_manager.fetch_market_data.assert_called_once_with(
+            symbols=["BTCUSDT"], start_date="2024-05-01", end_date="2024-05-02", interval="1m"
+        )
+
+    def test_count_market_hours_without_data(self, backtester):
+        """Test the calendar span is used when no data is available."""
+        backtester.data_manager.fetch_market_data.side_effect = lambda symbols, **kwargs: {}
+
+        assert backtester._count_market_hours("2024-05-01", "2024-05-03") == 48
+
+
+class TestContainerRun:
+    """Test the container lifecycle with a mocked Docker client."""
+
+    def test_market_data_mounted_read_only(self, backtester):
+        """Test that staged market data is mounted for the agent and cleaned up."""
+        container = MagicMock()
+        container.logs.return_value = iter([TRADE_LOGS])
+        staged = {}
+
+        def run_container(image, volumes, **kwargs):
+            (data_dir, mount), = volumes.items()
+            staged.update(data_dir=data_dir, mount=mount, files=sorted(os.listdir(data_dir)))
+            return container
+
+        backtester.docker_client.containers.run.side_effect = run_container
+        backtester.docker_client.images.get.return_value.labels = {}
+
+        backtester.run("test/arbitrage-agent:latest", "2024-05-01", "2024-05-02")
+
+        assert staged["mount"] == {"bind": "/data", "mode": "ro"}
+        assert staged["files"] == ["BTCUSDT.csv", "ETHUSDT.csv"]
+        assert not os.path.exists(staged["data_dir"])
+
+
+    def test_local_log_driver(self, backtester):
+        """Test that agents log through Docker's capped local driver."""
+        container = MagicMock()
+        container.logs.return_value = iter([TRADE_LOGS])
+        backtester.docker_client.containers.run.return_value = container
+        backtester.docker_client.images.get.return_value.labels = {}
+
+        backtester.run("test/arbitrage-agent:latest", "2024-05-01", "2024-05-02")
+
+        log_config = backtester.docker_client.containers.run.call_args.kwargs["log_config"]
+        assert log_config["Type"] == "local"
+        assert log_config["Config"] == {"max-size": "50m", "max-file": "1"}
+
+    def test_scratch_space_and_fd_limit(self, backtester):
+        """Test that agents get tmpfs scratch space and a raised fd limit."""
+        container = MagicMock()
+        container.logs.return_value = iter([TRADE_LOGS])
+        backtester.docker_client.containers.run.return_value = container
+        backtester.docker_client.images.get.return_value.labels = {}
+
+        backtester.run("test/arbitrage-agent:latest", "2024-05-01", "2024-05-02")
+
+        kwargs = backtester.docker_client.containers.run.call_args.kwargs
+        assert kwargs["tmpfs"] == {"/tmp": "rw,size=256m"}
+        (ulimit,) = kwargs["ulimits"]
+        assert (ulimit.name, ulimit.soft, ulimit.hard) == ("nofile", 65535, 65535)
+
+    def test_strategy_type_from_label(self, backtester):
+        """Test that the image label takes precedence over the image name."""
+        backtester.docker_client.images.get.return_value.labels = {
+            "arc.strategy_type": "momentum"
+        }
+
+        assert backtester._detect_strategy_type("test/arbitrage-agent") == "momentum"
+        assert backtester._detect_strategy_type("test/arbitrage-agent") == "momentum"
+        backtester.docker_client.images.get.assert_called_once()
+
+    def test_strategy_type_from_name(self, backtester):
+        """Test the name heuristics when the image is not available locally."""
+        backtester.docker_client.images.get.side_effect = docker.errors.ImageNotFound("missing")
+
+        assert backtester._detect_strategy_type("test/market-maker") == "market_making"
+
+
+class TestContainerTimeout:
+    """Test the watcher enforcing the backtest time budget."""
+
+    def test_run_waits_for_agent(self, backtester):
+        """Test a full backtest run against a mocked container."""
+        container = MagicMock()
+        container.logs.return_value = iter([TRADE_LOGS])
+        backtester.docker_client.containers.run.return_value = container
+        backtester.docker_client.images.get.return_value.labels = {}
+
+        result = backtester.run("test/arbitrage-agent:latest", "2024-05-01", "2024-05-02")
+
+        assert result.metrics.total_trades == 3
+        container.wait.assert_called_once_with(timeout=30)
+        container.stop.assert_not_called()
+        container.remove.assert_called_once_with(force=True)
+
+    def test_overrun_stops_container(self, backtester):
+        """Test that an agent still running at the deadline is stopped."""
+        container = MagicMock()
+        container.wait.side_effect = requests.exceptions.ReadTimeout()
+
+        backtester._wait_or_stop(container, 5)
+
+        container.wait.assert_called_once_with(timeout=5)
+        container.stop.assert_called_once_with(timeout=10)
+
+    def test_stop_after_exit_ignored(self, backtester):
+        """Test that stopping an agent that already exited is not an error."""
+        container = MagicMock()
+        container.wait.side_effect = requests.exceptions.ConnectionError()
+        container.stop.side_effect = docker.errors.APIError("gone")
+
+        backtester._wait_or_stop(container, 5)
+
+        container.stop.assert_called_once()
+
+
+class TestRunMany:
+    """Test concurrent backtests of several agents."""
+
+    async def test_results_in_input_order(self, backtester):
+        """Test that each image gets its result or its exception, in order."""
+        def run_container(image, **kwargs):
+            if image.startswith("broken"):
+                raise docker.errors.ImageNotFound(image)
+            container = MagicMock()
+            container.logs.return_value = iter([TRADE_LOGS])
+            return container
+
+        backtester.docker_client.containers.run.side_effect = run_container
+        backtester.docker_client.images.get.return_value.labels = {}
+
+        results = await backtester.run_many(
+            ["test/arbitrage-agent:latest", "broken/agent:latest", "test/momentum-agent:latest"],
+            "2024-05-01",
+            "2024-05-02",
+            max_concurrent=2,
+        )
+
+        assert [result.agent_id for result in results[::2]] == [
+            "test/arbitrage-agent:latest", "test/momentum-agent:latest"
+        ]
+        assert [result.strategy_type for result in results[::2]] == ["arbitrage", "momentum"]
+        assert isinstance(results[1], docker.errors.ImageNotFound)
+        # Concurrent backtests of one period share a single market data fetch
+        backtester.data_manager.fetch_market_data.assert_called_once()
+
+
+class TestSharedDataSources:
+    """Test sharing of market data sources between backtesters."""
+
+    @patch('docker.from_env')
+    @patch('arc_verifier.data.container_backtester.MarketDataManager')
+    def test_default_data_manager_is_shared(self, mock_manager, mock_docker):
+        """Test that backtesters without an injected manager share one."""
+        with patch.object(ContainerBacktester, '_shared_data_manager', None):
+            first = ContainerBacktester()
+            second = ContainerBacktester()
+
+        assert first.data_manager is second.data_manager
+        assert first.market_data_cache is second.market_data_cache
+        mock_manager.assert_called_once()
+
+    def test_injected_data_manager(self, backtester):
+        """Test that an injected manager gets its own cache."""
+        assert backtester.market_data_cache is not ContainerBacktester._shared_market_data_cache
+        assert backtester.registry is backtester.data_manager.registry
@@ -1,8 +1,13 @@
 """Tests for the new LLM Judge architecture."""
 
+import asyncio
+import httpx
+import json
 import pytest
+from collections import OrderedDict
 from datetime import datetime
-from unittest.mock import Mock, patch, MagicMock
+from pydantic import ValidationError
+from unittest.mock import AsyncMock, Mock, patch, MagicMock, PropertyMock
 
 from arc_verifier.analysis.llm_judge import (
     LLMJudge, 
@@ -17,6 +22,40 @@ from arc_verifier.analysis.llm_judge import (
     TrustFocusedResult,
     LLMJudgeResult
 )
+from arc_verifier.analysis.llm_judge.evaluation.ensemble import EnsembleEvaluator
+from arc_verifier.analysis.llm_judge.providers.anthropic import (
+    MOCK_RESPONSE as ANTHROPIC_MOCK_RESPONSE,
+    AnthropicProvider,
+)
+from arc_verifier.analysis.llm_judge.providers.base import BaseLLMProvider
+from arc_verifier.analysis.llm_judge.providers.limits import (
+    CircuitBreaker,
+    ProviderUnavailableError,
+    RateLimiter,
+)
+from arc_verifier.analysis.llm_judge.providers.openai import OpenAIProvider
+from arc_verifier.analysis.llm_judge.security.analyzers import (
+    CapitalRiskAnalyzer,
+    CombinedSecurityAnalyzer,
+    KeySecurityAnalyzer,
+)
+from arc_verifier.analysis.llm_judge.security.prompts import (
+    SECURITY_SYSTEM_PROMPT,
+    build_combined_security_prompt,
+)
+from arc_verifier.analysis.llm_judge.security.scoring import TrustScoreCalculator
+from arc_verifier.analysis.llm_judge.utils import (
+    ImageData,
+    extract_agent_patterns,
+    extract_json_block,
+    prepare_evaluation_context,
+    summarize_vulnerabilities,
+)
+
+# A real (non-mock) provider answer, distinguishable from MOCK_RESPONSE
+REAL_RESPONSE = ANTHROPIC_MOCK_RESPONSE.replace(
+    '"confidence_level": 0.8', '"confidence_level": 0.75'
+)
 
 
 class TestLLMJudgeNewArchitecture:
@@ -83,10 +122,8 @@ class TestLLMJudgeNewArchitecture:
         mock_prepare_context.return_value = mock_context
         
         # Mock analyzer results
-        with patch.object(self.judge.key_security_analyzer, 'analyze') as mock_key_sec, \
-             patch.object(self.judge.transaction_control_analyzer, 'analyze') as mock_tx_ctrl, \
-             patch.object(self.judge.deception_detector, 'analyze') as mock_deception, \
-             patch.object(self.judge.capital_risk_analyzer, 'analyze') as mock_capital, \
+        mock_key_sec, mock_tx_ctrl, mock_deception, mock_capital = Mock(), Mock(), Mock(), Mock()
+        with patch.object(self.judge.security_analyzer, 'analyze') as mock_combined, \
              patch.object(self.judge.trust_score_calculator, 'calculate_trust_assessment') as mock_trust:
             
             # Configure mock returns
@@ -143,6 +180,12 @@ class TestLLMJudgeNewArchitecture:
                 reasoning="Strong security controls with no major risks detected"
             )
             mock_trust.return_value = mock_trust_result
+            mock_combined.return_value = {
+                "key_security": mock_key_sec.return_value,
+                "transaction_control": mock_tx_ctrl.return_value,
+                "deception_detection": mock_deception.return_value,
+                "capital_risk": mock_capital.return_value,
+            }
             
             # Run the evaluation
             result = self.judge.evaluate_agent_security(
@@ -156,12 +199,14 @@ class TestLLMJudgeNewArchitecture:
             assert result.can_trust_with_capital == True
             assert result.confidence_level == 0.9
             
-            # Verify all analyzers were called
-            mock_key_sec.assert_called_once()
-            mock_tx_ctrl.assert_called_once()
-            mock_deception.assert_called_once()
-            mock_capital.assert_called_once()
-            mock_trust.assert_called_once()
+            # Verify one combined analysis fed the trust assessment
+            mock_combined.assert_called_once()
+            mock_trust.assert_called_once_with(
+                mock_key_sec.return_value,
+                mock_tx_ctrl.return_value,
+                mock_deception.return_value,
+                mock_capital.return_value,
+            )
     
     @patch('arc_verifier.analysis.llm_judge.core.prepare_evaluation_context')
     def test_evaluate_agent_security_failure_fallback(self, mock_prepare_context):
@@ -236,7 +281,7 @@ class TestLLMJudgeNewArchitecture:
         mock_prepare_context.return_value = mock_context
         
         # Mock ensemble evaluator
-        with patch.object(self.judge.ensemble_evaluator, 'run_evaluation') as mock_evaluation:
+        with patch.object(self.judge.ensemble_evaluator, 'run_evaluation_async') as mock_evaluation:
             mock_result = LLMJudgeResult(
                 intent_classification=AgentIntentClassification(
                     primary_strategy="arbitrage",
@@ -281,6 +326,780 @@ class TestLLMJudgeNewArchitecture:
             
             mock_evaluation.assert_called_once()
 
+    @patch('arc_verifier.analysis.llm_judge.core.prepare_evaluation_context')
+    def test_evaluate_agent_uses_one_timestamp(self, mock_prepare_context):
+        """Test that the context and evaluation share one timestamp."""
+        mock_prepare_context.return_value = {"image_info": {"tag": "test:latest"}}
+
+        with patch.object(self.judge.ensemble_evaluator, 'run_evaluation_async') as mock_evaluation:
+            self.judge.evaluate_agent(self.sample_image_data)
+
+        now = mock_prepare_context.call_args.kwargs["now"]
+        assert isinstance(now, datetime)
+        assert mock_evaluation.call_args.kwargs["now"] is now
+
+    @patch.dict(LLMJudge._shared, clear=True)
+    def test_shared_judge_reused(self):
+        """Test that the shared judge is built once per primary provider."""
+        judge = LLMJudge.shared("anthropic")
+
+        assert LLMJudge.shared(LLMProvider.ANTHROPIC) is judge
+        assert LLMJudge.shared(LLMProvider.OPENAI) is not judge
+
+
+class TestBatchEvaluation:
+    """Test concurrent evaluation of several agents."""
+
+    def test_evaluate_agents_bounded_concurrency(self):
+        """Test that batch evaluation keeps order and respects the limit."""
+        judge = LLMJudge(enable_ensemble=False)
+        in_flight = 0
+        peak = 0
+
+        async def fake_evaluate(image_data, market_context=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return image_data["image_tag"]
+
+        images = [{"image_tag": f"agent-{i}"} for i in range(6)]
+        with patch.object(judge, 'evaluate_agent_async', side_effect=fake_evaluate):
+            results = judge.evaluate_agents(images, max_concurrency=2)
+
+        assert results == [image["image_tag"] for image in images]
+        assert peak == 2
+
+    def test_evaluate_agents_batch(self):
+        """Test that uncached prompts go to the provider as one batch."""
+        judge = LLMJudge(enable_ensemble=False)
+        provider = Mock()
+        provider.provider_type = LLMProvider.ANTHROPIC
+        provider.call_llm_batch_async = AsyncMock(return_value={
+            "0": AnthropicProvider().generate_mock_response(""),
+            "1": "not json",
+        })
+        judge.primary_llm_provider = provider
+
+        with patch.object(EnsembleEvaluator, '_result_cache', OrderedDict()):
+            results = judge.evaluate_agents_batch(
+                [{"image_tag": "agent-0"}, {"image_tag": "agent-1"}]
+            )
+
+        provider.call_llm_batch_async.assert_awaited_once()
+        assert list(provider.call_llm_batch_async.call_args.args[0]) == ["0", "1"]
+        assert results[0].trust_recommendation == "DEPLOY"
+        assert results[1].trust_recommendation == "DO_NOT_DEPLOY"
+
+    @patch.dict('os.environ', {'ANTHROPIC_API_KEY': 'test-key'})
+    def test_unavailable_provider_falls_back_per_prompt(self):
+        """Test that prompts refused by an open circuit get the fallback."""
+        judge = LLMJudge(enable_ensemble=False)
+        provider = AnthropicProvider()
+        provider.call_llm_async = AsyncMock(side_effect=[
+            REAL_RESPONSE, ProviderUnavailableError("circuit open"),
+        ])
+        judge.primary_llm_provider = provider
+        # The batch job cannot be submitted, so each prompt is sent on its own
+        client = Mock(post=AsyncMock(side_effect=httpx.ConnectError("offline")))
+
+        with patch.object(EnsembleEvaluator, '_result_cache', OrderedDict()), \
+             patch.object(AnthropicProvider, 'client', new_callable=PropertyMock, return_value=client):
+            results = judge.evaluate_agents_batch(
+                [{"image_tag": "agent-0"}, {"image_tag": "agent-1"}]
+            )
+
+        assert results[0].confidence_level == 0.75
+        assert results[1].trust_recommendation == "DO_NOT_DEPLOY"
+
+    @patch.dict('os.environ', {'ANTHROPIC_API_KEY': 'test-key'})
+    def test_anthropic_message_batch(self):
+        """Test batch submission, polling and per-request fallback."""
+        provider = AnthropicProvider()
+        provider.call_llm_async = AsyncMock(return_value="real-time")
+        succeeded = {
+            "custom_id": "a",
+            "result": {"type": "succeeded", "message": {"content": [{"type": "text", "text": "batched"}]}},
+        }
+        errored = {"custom_id": "b", "result": {"type": "errored"}}
+        client = Mock()
+        client.post = AsyncMock(return_value=Mock(json=Mock(return_value={"id": "batch_1"})))
+        client.get = AsyncMock(side_effect=[
+            Mock(json=Mock(return_value={"processing_status": "in_progress"})),
+            Mock(json=Mock(return_value={"processing_status": "ended", "results_url": "https://results"})),
+            Mock(text=f"{json.dumps(succeeded)}\n{json.dumps(errored)}\n"),
+        ])
+
+        with patch.object(AnthropicProvider, 'client', new_callable=PropertyMock, return_value=client), \
+             patch('asyncio.sleep', new=AsyncMock()):
+            responses = asyncio.run(
+                provider.call_llm_batch_async({"a": "first", "b": "second"}, system_prompt="rubric")
+            )
+
+        assert responses == {"a": "batched", "b": "real-time"}
+        requests = json.loads(client.post.call_args.kwargs["content"])["requests"]
+        assert [request["custom_id"] for request in requests] == ["a", "b"]
+        assert "stream" not in requests[0]["params"]
+        provider.call_llm_async.assert_awaited_once_with("second", "rubric")
+
+    @patch.dict('os.environ', {'ANTHROPIC_API_KEY': 'test-key', 'LLM_BATCH_TIMEOUT_SECONDS': '0'})
+    def test_overdue_batch_cancelled_keeping_results(self):
+        """Test that an overdue batch is cancelled and its finished results kept."""
+        provider = AnthropicProvider()
+        provider.call_llm_async = AsyncMock(return_value="real-time")
+        succeeded = {
+            "custom_id": "a",
+            "result": {"type": "succeeded", "message": {"content": [{"type": "text", "text": "batched"}]}},
+        }
+        canceled = {"custom_id": "b", "result": {"type": "canceled"}}
+        client = Mock()
+        client.post = AsyncMock(side_effect=[
+            Mock(json=Mock(return_value={"id": "batch_1"})),
+            Mock(json=Mock(return_value={"processing_status": "canceling"})),
+        ])
+        client.get = AsyncMock(side_effect=[
+            Mock(json=Mock(return_value={"processing_status": "in_progress"})),
+            Mock(json=Mock(return_value={"processing_status": "ended", "results_url": "https://results"})),
+            Mock(text=f"{json.dumps(succeeded)}\n{json.dumps(canceled)}\n"),
+        ])
+
+        with patch.object(AnthropicProvider, 'client', new_callable=PropertyMock, return_value=client), \
+             patch('asyncio.sleep', new=AsyncMock()):
+            responses = asyncio.run(provider.call_llm_batch_async({"a": "first", "b": "second"}))
+
+        assert client.post.call_args.args[0].endswith("/batches/batch_1/cancel")
+        assert responses == {"a": "batched", "b": "real-time"}
+        provider.call_llm_async.assert_awaited_once_with("second", None)
+
+
+class TestEnsembleResultCache:
+    """Test caching of parsed LLM evaluation results."""
+
+    def setup_method(self):
+        """Set up an evaluator with an empty cache."""
+        self.evaluator = EnsembleEvaluator()
+        self.evaluator.cache_ttl = 60
+        self.provider = AnthropicProvider()
+        self.provider.call_llm_async = AsyncMock(return_value=REAL_RESPONSE)
+        self.context = {
+            "image_info": {
+                "tag": "shade/arbitrage-agent:latest",
+                "size": 1024 * 1024,
+                "layers": 2,
+                "shade_agent_detected": True,
+                "vulnerabilities": {"CRITICAL": 0, "HIGH": 0, "MEDIUM": 1, "LOW": 0},
+            },
+            "agent_patterns": {"dependencies": ["pip install web3"]},
+        }
+
+    def test_identical_prompt_uses_cache(self):
+        """Test that a repeated evaluation skips the provider call."""
+        with patch.object(EnsembleEvaluator, '_result_cache', OrderedDict()):
+            first = self.evaluator.run_evaluation(self.context, self.provider)
+            second = self.evaluator.run_evaluation(self.context, self.provider)
+
+        assert self.provider.call_llm_async.call_count == 1
+        assert second is first
+
+    def test_unparseable_response_not_cached(self):
+        """Test that fallback assessments are not cached."""
+        self.provider.call_llm_async.return_value = "not json"
+
+        with patch.object(EnsembleEvaluator, '_result_cache', OrderedDict()):
+            first = self.evaluator.run_evaluation(self.context, self.provider)
+            self.evaluator.run_evaluation(self.context, self.provider)
+
+        assert first.trust_recommendation == "DO_NOT_DEPLOY"
+        assert self.provider.call_llm_async.call_count == 2
+
+    @patch.dict('os.environ', {'ANTHROPIC_API_KEY': 'test-key'})
+    def test_failed_call_not_cached(self):
+        """Test that the mock answer to a failed call is not served from cache."""
+        provider = AnthropicProvider()
+        stream_text = AsyncMock(side_effect=[RuntimeError("HTTP 400"), REAL_RESPONSE])
+
+        with patch.object(EnsembleEvaluator, '_result_cache', OrderedDict()), \
+             patch.object(provider, '_stream_text', stream_text):
+            failed = self.evaluator.run_evaluation(self.context, provider)
+            recovered = self.evaluator.run_evaluation(self.context, provider)
+            cached = self.evaluator.run_evaluation(self.context, provider)
+
+        assert failed.confidence_level == 0.8
+        assert recovered.confidence_level == 0.75
+        assert cached is recovered
+        assert stream_text.await_count == 2
+
+
+def streaming_client(lines):
+    """Create a mock HTTP client whose stream() yields the given SSE lines."""
+    consumed = []
+
+    async def aiter_lines():
+        for line in lines:
+            consumed.append(line)
+            yield line
+
+    response = Mock(aiter_lines=aiter_lines)
+    stream = MagicMock()
+    stream.__aenter__ = AsyncMock(return_value=response)
+    stream.__aexit__ = AsyncMock(return_value=False)
+    return Mock(stream=Mock(return_value=stream), consumed=consumed)
+
+
+class TestEnsembleCombine:
+    """Test combination of primary and secondary evaluations."""
+
+    def test_combine_evaluations(self):
+        """Test weighted averaging of scores and score adjustments."""
+        evaluator = EnsembleEvaluator()
+        primary = evaluator._decode_llm_response(AnthropicProvider().generate_mock_response(""))
+        secondary = evaluator._decode_llm_response(OpenAIProvider().generate_mock_response(""))
+        secondary = secondary.model_copy(update={
+            "score_adjustments": {**secondary.score_adjustments, "innovative_strategy": 10.0}
+        })
+
+        combined = evaluator._combine_evaluations(primary, secondary)
+
+        assert combined.code_quality.architecture_score == pytest.approx(0.7 * 0.8 + 0.3 * 0.85)
+        assert combined.risk_assessment.regulatory_risk_score == pytest.approx(0.7 * 0.2 + 0.3 * 0.25)
+        assert combined.risk_assessment.liquidity_requirements == "medium"
+        assert combined.confidence_level == pytest.approx(0.7 * 0.8 + 0.3 * 0.78)
+        assert combined.score_adjustments["transparency"] == pytest.approx(0.7 * 6.0 + 0.3 * 8.0)
+        assert combined.score_adjustments["innovative_strategy"] == pytest.approx(3.0)
+
+    def test_combine_evaluations_preserves_order(self):
+        """Test that merged findings and flags are deduplicated in order."""
+        evaluator = EnsembleEvaluator()
+        primary = evaluator._decode_llm_response(AnthropicProvider().generate_mock_response(""))
+        secondary = evaluator._decode_llm_response(OpenAIProvider().generate_mock_response(""))
+        secondary = secondary.model_copy(update={
+            "behavioral_flags": ["Uses flash loans", "High-frequency trading patterns detected"]
+        })
+
+        combined = evaluator._combine_evaluations(primary, secondary)
+
+        assert combined.behavioral_flags == [
+            "High-frequency trading patterns detected",
+            "Uses flash loans",
+        ]
+        assert combined.code_quality.key_findings == (
+            primary.code_quality.key_findings + secondary.code_quality.key_findings
+        )
+
+
+class TestEnsembleShortCircuit:
+    """Test skipping the secondary model for confident primary results."""
+
+    def setup_method(self):
+        """Set up an evaluator with mock providers and no result cache."""
+        self.evaluator = EnsembleEvaluator()
+        self.evaluator.cache_ttl = 0
+        self.evaluator.confidence_threshold = 0.8
+        self.context = {
+            "image_info": {
+                "tag": "shade/arbitrage-agent:latest",
+                "size": 0,
+                "layers": 0,
+                "shade_agent_detected": False,
+                "vulnerabilities": {},
+            }
+        }
+        self.primary = AnthropicProvider()
+        self.secondary = OpenAIProvider()
+        self.secondary_finished = False
+
+        async def quick_primary(prompt, system_prompt=None):
+            await asyncio.sleep(0.01)
+            return self.primary.generate_mock_response(prompt)
+
+        self.primary.call_llm_async = AsyncMock(side_effect=quick_primary)
+
+        async def slow_secondary(prompt, system_prompt=None):
+            await asyncio.sleep(0.05)
+            self.secondary_finished = True
+            return self.secondary.generate_mock_response(prompt)
+
+        self.secondary.call_llm_async = AsyncMock(side_effect=slow_secondary)
+
+    def run_ensemble(self):
+        return asyncio.run(self.evaluator.run_ensemble_evaluation_async(
+            self.context, self.primary, self.secondary
+        ))
+
+    def test_confident_primary_cancels_secondary(self):
+        """Test that a confident primary result is returned on its own."""
+        result = self.run_ensemble()
+
+        assert result.confidence_level == 0.8
+        assert not result.reasoning.startswith("Ensemble evaluation")
+        self.secondary.call_llm_async.assert_called_once()
+        assert not self.secondary_finished
+
+    def test_borderline_primary_waits_for_secondary(self):
+        """Test that a less confident primary result is combined."""
+        self.evaluator.confidence_threshold = 0.9
+
+        result = self.run_ensemble()
+
+        assert result.reasoning.startswith("Ensemble evaluation")
+        assert self.secondary_finished
+
+
+class TestProviderPayloads:
+    """Test requests sent to and responses streamed from LLM providers."""
+
+    @patch.dict('os.environ', {'ANTHROPIC_API_KEY': 'test-key'})
+    def test_anthropic_system_prompt_cached(self):
+        """Test that the system prompt is sent as an ephemeral cache block."""
+        provider = AnthropicProvider()
+        client = streaming_client([
+            'event: content_block_delta',
+            'data: {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "o"}}',
+            'data: {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "k"}}',
+            'data: {"type": "message_stop"}',
+        ])
+
+        with patch.object(AnthropicProvider, 'client', new_callable=PropertyMock, return_value=client):
+            response = provider.call_llm("agent context", system_prompt="rubric")
+
+        payload = json.loads(client.stream.call_args.kwargs["content"])
+        assert response == "ok"
+        assert payload["stream"] is True
+        assert payload["system"] == [
+            {"type": "text", "text": "rubric", "cache_control": {"type": "ephemeral"}}
+        ]
+        assert payload["messages"] == [{"role": "user", "content": "agent context"}]
+
+    @patch.dict('os.environ', {'OPENAI_API_KEY': 'test-key'})
+    def test_openai_stream_stops_after_json_block(self):
+        """Test that streaming stops once a complete JSON block has arrived."""
+        provider = OpenAIProvider()
+        chunks = ['```json\n{"a": 1}', '\n``', '`', ' trailing text']
+        client = streaming_client(
+            [f"data: {json.dumps({'choices': [{'delta': {'content': chunk}}]})}" for chunk in chunks]
+            + ["data: [DONE]"]
+        )
+
+        with patch.object(OpenAIProvider, 'client', new_callable=PropertyMock, return_value=client):
+            response = provider.call_llm("agent context")
+
+        assert response == '```json\n{"a": 1}\n```'
+        # Nothing after the closing fence is read
+        assert len(client.consumed) == 3
+
+    @patch.dict('os.environ', {'ANTHROPIC_API_KEY': 'test-key'})
+    def test_stream_not_read_past_json_block(self):
+        """Test that a stream failing after the JSON block still succeeds."""
+        provider = AnthropicProvider()
+        block = '```json\n{"a": 1}\n```'
+        client = streaming_client([])
+
+        async def fail_after_block():
+            yield 'data: ' + json.dumps({"type": "content_block_delta", "delta": {"text": block}})
+            raise AssertionError("stream read past the JSON block")
+
+        client.stream.return_value.__aenter__.return_value.aiter_lines = fail_after_block
+
+        with patch.object(AnthropicProvider, 'client', new_callable=PropertyMock, return_value=client):
+            response = provider.call_llm("agent context")
+
+        assert response == block
+
+    @patch.dict('os.environ', {'ANTHROPIC_API_KEY': 'test-key'})
+    def test_warm_up_opens_connection(self):
+        """Test that warm-up reaches configured providers only."""
+        anthropic = AnthropicProvider()
+        with patch.dict('os.environ', {'OPENAI_API_KEY': ''}):
+            openai = OpenAIProvider()
+        client = Mock(head=AsyncMock(side_effect=httpx.ConnectError("offline")))
+
+        with patch.object(BaseLLMProvider, 'client', new_callable=PropertyMock, return_value=client):
+            asyncio.run(anthropic.warm_up())
+            asyncio.run(openai.warm_up())
+
+        client.head.assert_awaited_once_with(anthropic.api_url, timeout=anthropic.timeout)
+
+    async def test_providers_share_pooled_client(self):
+        """Test that providers on one event loop share an HTTP client."""
+        anthropic, openai = AnthropicProvider(), OpenAIProvider()
+
+        assert anthropic.client is openai.client
+
+        client = anthropic.client
+        await anthropic.aclose()
+        assert client.is_closed
+        assert openai.client is not client
+        await openai.aclose()
+
+    @patch.dict('os.environ', {'ANTHROPIC_API_KEY': 'test-key'})
+    def test_sync_calls_close_their_client(self):
+        """Test that repeated sync calls do not accumulate open clients."""
+        provider = AnthropicProvider()
+        clients = []
+
+        async def stream_text(*args, **kwargs):
+            clients.append(provider.client)
+            return REAL_RESPONSE
+
+        with patch.object(provider, '_stream_text', side_effect=stream_text):
+            before = len(BaseLLMProvider._clients)
+            for _ in range(3):
+                assert provider.call_llm("agent context") == REAL_RESPONSE
+            after = len(BaseLLMProvider._clients)
+
+        assert after == before
+        assert len(clients) == 3
+        assert all(client.is_closed for client in clients)
+
+
+class TestCombinedSecurityAnalysis:
+    """Test that the security analyzers share one LLM call."""
+
+    def setup_method(self):
+        """Give each test an empty shared result cache."""
+        self.cache_patch = patch.object(CombinedSecurityAnalyzer, '_results', OrderedDict())
+        self.cache_patch.start()
+
+    def teardown_method(self):
+        """Restore the shared result cache."""
+        self.cache_patch.stop()
+
+    COMPLETE_RESPONSE = "```json\n" + json.dumps({
+        "key_security": {"has_plaintext_keys": "no", "key_exposure_risk": "low"},
+        "transaction_control": {"has_spending_limits": True},
+        "deception_detection": {"risk_level": "low"},
+        "capital_risk": {"max_loss_bounded": True},
+    }) + "\n```"
+
+    def test_one_call_serves_all_analyzers(self):
+        """Test that per-analyzer wrappers reuse the combined response."""
+        provider = Mock()
+        provider.provider_type = LLMProvider.ANTHROPIC
+        provider.call_llm.return_value = self.COMPLETE_RESPONSE
+        combined = CombinedSecurityAnalyzer()
+        context = {"image_info": {"tag": "agent:latest"}}
+
+        key_result = KeySecurityAnalyzer(combined).analyze(context, provider)
+        capital_result = CapitalRiskAnalyzer(combined).analyze(context, provider)
+        results = combined.analyze(dict(context), provider)
+
+        provider.call_llm.assert_called_once()
+        assert provider.call_llm.call_args.args[1] is SECURITY_SYSTEM_PROMPT
+        assert key_result.has_plaintext_keys is False
+        assert key_result.key_exposure_risk == "low"
+        assert capital_result.max_loss_bounded is True
+        assert results["transaction_control"].has_spending_limits is True
+        # Cached results are shared, so they must be immutable
+        with pytest.raises(ValidationError):
+            key_result.key_exposure_risk = "critical"
+
+    def test_incomplete_response_not_cached(self):
+        """Test that missing or malformed sections are re-requested."""
+        provider = Mock()
+        provider.provider_type = LLMProvider.ANTHROPIC
+        provider.call_llm.side_effect = [
+            "```json\n" + json.dumps({
+                "key_security": {"has_plaintext_keys": "no", "key_exposure_risk": "low"},
+                "capital_risk": {"max_loss_bounded": True},
+                "deception_detection": ["not", "an", "object"],
+            }) + "\n```",
+            self.COMPLETE_RESPONSE,
+        ]
+        combined = CombinedSecurityAnalyzer()
+
+        partial = combined.analyze({}, provider)
+        recovered = combined.analyze({}, provider)
+        cached = combined.analyze({}, provider)
+
+        # Missing sections get conservative defaults, malformed ones the fallback
+        assert partial["transaction_control"].has_spending_limits is False
+        assert partial["deception_detection"].risk_level == "high"
+        assert recovered["deception_detection"].risk_level == "low"
+        assert cached is recovered
+        assert provider.call_llm.call_count == 2
+
+    def test_async_analyzers_share_one_call(self):
+        """Test that concurrent async analyzers await one in-flight call."""
+        judge = LLMJudge(enable_ensemble=False)
+        provider = Mock()
+        provider.provider_type = LLMProvider.ANTHROPIC
+        provider.call_llm_async = AsyncMock(return_value="```json\n{}\n```")
+        judge.primary_llm_provider = provider
+
+        result = asyncio.run(judge.evaluate_agent_security_async({"image_tag": "agent:latest"}))
+
+        provider.call_llm_async.assert_awaited_once()
+        assert isinstance(result, TrustFocusedResult)
+        assert result.key_security.has_plaintext_keys is True
+
+    @patch.dict('os.environ', {'LLM_CACHE_TTL_SECONDS': '0'})
+    def test_sync_evaluation_makes_one_call(self):
+        """Test that the sync path issues one combined call without the cache."""
+        judge = LLMJudge(enable_ensemble=False)
+        provider = Mock()
+        provider.provider_type = LLMProvider.ANTHROPIC
+        provider.call_llm.return_value = self.COMPLETE_RESPONSE
+        judge.primary_llm_provider = provider
+
+        result = judge.evaluate_agent_security({"image_tag": "agent:latest"})
+
+        provider.call_llm.assert_called_once()
+        assert result.key_security.key_exposure_risk == "low"
+        assert result.capital_risk.max_loss_bounded is True
+
+    def test_identical_prompt_reuses_analysis(self):
+        """Test that contexts rendering the same prompt share one call."""
+        provider = Mock()
+        provider.provider_type = LLMProvider.ANTHROPIC
+        provider.call_llm.return_value = self.COMPLETE_RESPONSE
+        image_data = {"image_tag": "agent:latest"}
+
+        first = CombinedSecurityAnalyzer().analyze(
+            prepare_evaluation_context(image_data, None, None, now=datetime(2025, 1, 1)), provider
+        )
+        second = CombinedSecurityAnalyzer().analyze(
+            prepare_evaluation_context(
+                image_data, None, {"status": "volatile"}, now=datetime(2025, 1, 2)
+            ),
+            provider,
+        )
+
+        provider.call_llm.assert_called_once()
+        assert second is first
+
+    def test_combined_prompt_ignores_unrelated_context(self):
+        """Test that contexts with the same image and patterns render one prompt."""
+        image_data = {"image_tag": "agent:latest", "layers": [{"command": "RUN pip install web3"}]}
+
+        first = build_combined_security_prompt(
+            prepare_evaluation_context(image_data, None, None, now=datetime(2025, 1, 1))
+        )
+        second = build_combined_security_prompt(
+            prepare_evaluation_context(image_data, None, {"status": "volatile"})
+        )
+
+        assert second == first
+        assert "pip install web3" in first
+        assert '"key_security": {...}' not in first
+        assert '"key_security": {...}' in SECURITY_SYSTEM_PROMPT
+
+    def test_analyzer_specs_cover_result_fields(self):
+        """Test that every analyzer defines a value for each result field."""
+        for analyzer in CombinedSecurityAnalyzer.ANALYZERS.values():
+            fields = set(analyzer.result_cls.model_fields)
+            assert set(analyzer.defaults) == fields
+            assert analyzer._generate_fallback_result() is analyzer.fallback
+
+    def test_call_failure_falls_back(self):
+        """Test that a failed call yields every fallback result uncached."""
+        provider = Mock()
+        provider.provider_type = LLMProvider.OPENAI
+        provider.call_llm.side_effect = RuntimeError("boom")
+        combined = CombinedSecurityAnalyzer()
+
+        results = combined.analyze({}, provider)
+        combined.analyze({}, provider)
+
+        assert results["key_security"].key_exposure_risk == "critical"
+        assert provider.call_llm.call_count == 2
+
+
+class TestProviderLimits:
+    """Test client-side rate limiting and circuit breaking."""
+
+    def test_rate_limiter_allows_burst_then_paces(self):
+        """Test that requests beyond the burst wait for a refill."""
+        limiter = RateLimiter(requests_per_minute=60, burst=2)
+
+        assert limiter._reserve() == 0.0
+        assert limiter._reserve() == 0.0
+        assert limiter._reserve() == pytest.approx(1.0, abs=0.05)
+
+    @patch.dict('os.environ', {'ANTHROPIC_API_KEY': 'test-key'})
+    def test_open_circuit_skips_provider(self):
+        """Test that consecutive outages stop further API calls."""
+        provider = AnthropicProvider()
+        provider.max_retries = 0
+        client = Mock(stream=Mock(side_effect=httpx.ConnectError("offline")))
+        breaker = CircuitBreaker(failure_threshold=2, reset_seconds=60)
+
+        with patch.object(AnthropicProvider, 'client', new_callable=PropertyMock, return_value=client), \
+             patch.object(AnthropicProvider, 'circuit_breaker', new_callable=PropertyMock, return_value=breaker):
+            responses = [provider.call_llm("agent context") for _ in range(2)]
+            # An open circuit is raised rather than answered with a mock
+            with pytest.raises(ProviderUnavailableError):
+                provider.call_llm("agent context")
+
+        assert client.stream.call_count == 2
+        assert responses == [provider.generate_mock_response("")] * 2
+
+    @patch.dict('os.environ', {'ANTHROPIC_API_KEY': 'test-key'})
+    def test_client_errors_do_not_open_circuit(self):
+        """Test that errors other than outages are not counted as failures."""
+        provider = AnthropicProvider()
+        client = Mock(stream=Mock(side_effect=RuntimeError("invalid_request_error")))
+        breaker = CircuitBreaker(failure_threshold=2, reset_seconds=60)
+
+        with patch.object(AnthropicProvider, 'client', new_callable=PropertyMock, return_value=client), \
+             patch.object(AnthropicProvider, 'circuit_breaker', new_callable=PropertyMock, return_value=breaker):
+            for _ in range(3):
+                provider.call_llm("agent context")
+
+        assert client.stream.call_count == 3
+        breaker.check()
+
+    def test_half_open_circuit_allows_one_trial(self):
+        """Test that only one call probes a circuit past its reset time."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+        breaker.record_failure()
+
+        breaker.check()
+        with pytest.raises(ProviderUnavailableError):
+            breaker.check()
+
+        # A failed trial re-opens the circuit, a successful one closes it
+        breaker.record_failure()
+        breaker.check()
+        breaker.record_success()
+        breaker.check()
+        breaker.check()
+
+    def test_rate_limiting_is_opt_in(self, monkeypatch):
+        """Test that requests are not paced unless a rate is configured."""
+        monkeypatch.delenv('LLM_REQUESTS_PER_MINUTE', raising=False)
+        with patch.object(BaseLLMProvider, '_rate_limiters', {}):
+            limiter = AnthropicProvider().rate_limiter
+
+        assert limiter.rate == 0
+
+    @patch.dict('os.environ', {'ANTHROPIC_API_KEY': 'test-key'})
+    @patch('asyncio.sleep', new_callable=AsyncMock)
+    def test_rate_limited_call_retried(self, mock_sleep):
+        """Test that a 429 is retried after the provider's retry-after delay."""
+        provider = AnthropicProvider()
+        request = httpx.Request("POST", provider.api_url)
+        rate_limited = httpx.HTTPStatusError(
+            "429", request=request,
+            response=httpx.Response(429, headers={"retry-after": "3"}, request=request),
+        )
+        client = streaming_client([
+            'data: {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "ok"}}',
+        ])
+        client.stream.side_effect = [rate_limited, client.stream.return_value]
+
+        with patch.object(AnthropicProvider, 'client', new_callable=PropertyMock, return_value=client), \
+             patch.object(AnthropicProvider, 'rate_limiter', new_callable=PropertyMock, return_value=RateLimiter(0)):
+            response = provider.call_llm("agent context")
+
+        assert response == "ok"
+        assert client.stream.call_count == 2
+        mock_sleep.assert_awaited_once_with(3.0)
+
+    @patch.dict('os.environ', {'ANTHROPIC_API_KEY': 'test-key'})
+    def test_auth_failure_not_retried(self):
+        """Test that client errors other than rate limiting fail at once."""
+        provider = AnthropicProvider()
+        request = httpx.Request("POST", provider.api_url)
+        unauthorized = httpx.HTTPStatusError(
+            "401", request=request, response=httpx.Response(401, request=request)
+        )
+
+        assert provider._retry_delay(unauthorized, attempt=0) is None
+        assert provider._retry_delay(httpx.ConnectError("offline"), attempt=0) is not None
+        assert provider._retry_delay(httpx.ConnectError("offline"), attempt=provider.max_retries) is None
+
+
+class TestAgentPatterns:
+    """Test agent pattern extraction from image layers."""
+
+    def test_extract_agent_patterns(self):
+        """Test that a command is recorded under every matching category."""
+        patterns = extract_agent_patterns([
+            {"command": "RUN pip install web3"},
+            {"command": "COPY secret.env /app"},
+            {"command": "ENTRYPOINT execonfig"},
+            {"command": "LABEL version=1"},
+            {},
+        ])
+
+        assert patterns["dependencies"] == ["run pip install web3"]
+        assert patterns["configurations"] == ["copy secret.env /app", "entrypoint execonfig"]
+        assert patterns["commands"] == ["run pip install web3", "entrypoint execonfig"]
+
+
+class TestImageData:
+    """Test one-pass extraction of the evaluated scan fields."""
+
+    def test_from_dict_normalizes_records(self):
+        """Test defaults, lowercased commands and normalized severities."""
+        image = ImageData.from_dict({
+            "layers": [{"command": "RUN Pip Install web3"}, {}],
+            "vulnerabilities": [{"severity": " high "}, {}],
+        })
+
+        assert image.tag == "unknown"
+        assert image.size == 0
+        assert image.layer_commands == ("run pip install web3", "")
+        assert image.severities == ("HIGH", "UNKNOWN")
+
+    def test_context_matches_record_helpers(self):
+        """Test that the context agrees with the per-record helpers."""
+        layers = [{"command": "RUN pip install web3"}, {"command": "COPY secret.env /app"}]
+        vulnerabilities = [{"severity": "critical"}, {"severity": "LOW"}]
+
+        context = prepare_evaluation_context(
+            {"image_tag": "agent:latest", "layers": layers, "vulnerabilities": vulnerabilities},
+            None,
+            None,
+        )
+
+        assert context["image_info"]["layers"] == 2
+        assert context["image_info"]["vulnerabilities"] == summarize_vulnerabilities(vulnerabilities)
+        assert context["agent_patterns"] == extract_agent_patterns(layers)
+
+
+class TestJsonBlockExtraction:
+    """Test extraction of fenced JSON from LLM responses."""
+
+    def test_extract_nested_block(self):
+        """Test that nested objects and braces inside strings are kept."""
+        response = 'Analysis:\n```json\n{"a": {"b": "}{\\"x"}, "c": 1}\n```\ntrailing {'
+
+        assert json.loads(extract_json_block(response)) == {"a": {"b": '}{"x'}, "c": 1}
+
+    def test_unfenced_and_unbalanced(self):
+        """Test that unfenced text is unchanged and unbalanced text fails to parse."""
+        assert extract_json_block('{"a": 1}') == '{"a": 1}'
+        with pytest.raises(json.JSONDecodeError):
+            json.loads(extract_json_block('```json\n{"a": {"b": 1}'))
+
+
+class TestVulnerabilitySummary:
+    """Test vulnerability severity counting."""
+
+    def test_summarize_vulnerabilities(self):
+        """Test that known severities are counted and others ignored."""
+        summary = summarize_vulnerabilities([
+            {"severity": "HIGH"},
+            {"severity": "LOW"},
+            {"severity": "HIGH"},
+            {"severity": "NEGLIGIBLE"},
+            {},
+        ])
+
+        assert summary == {"CRITICAL": 0, "HIGH": 2, "MEDIUM": 0, "LOW": 1}
+
+    def test_summarize_vulnerabilities_normalizes_severity(self):
+        """Test that severities are counted regardless of casing and padding."""
+        summary = summarize_vulnerabilities([
+            {"severity": "critical"},
+            {"severity": " High "},
+            {"severity": None},
+        ])
+
+        assert summary == {"CRITICAL": 1, "HIGH": 1, "MEDIUM": 0, "LOW": 0}
+
 
 class TestLLMJudgeModels:
     """Test LLM Judge data models."""
@@ -413,4 +1232,26 @@ class TestLLMJudgeModels:
         json_data = result.model_dump(mode='json')
         assert json_data['intent_classification']['primary_strategy'] == "arbitrage"
         assert json_data['confidence_level'] == 0.8
-        assert json_data['score_adjustments']['test'] == 5.0
\ No newline at end of file
+        assert json_data['score_adjustments']['test'] == 5.0
+
+    def test_llm_judge_result_frozen(self):
+        """Test that LLMJudgeResult instances can be shared safely."""
+        result = EnsembleEvaluator()._decode_llm_response(
+            AnthropicProvider().generate_mock_response("")
+        )
+
+        with pytest.raises(ValidationError):
+            result.confidence_level = 1.0
+        with pytest.raises(ValidationError):
+            result.code_quality.overall_score = 1.0
+
+    def test_fallback_trust_assessment_shared(self):
+        """Test that failed evaluations share one frozen fallback assessment."""
+        calculator = TrustScoreCalculator()
+        result = calculator.generate_fallback_trust_assessment({})
+
+        assert calculator.generate_fallback_trust_assessment({}) is result
+        assert result.key_security is KeySecurityAnalyzer.fallback
+        assert result.can_trust_with_capital is False
+        with pytest.raises(ValidationError):
+            result.trust_score = 1.0